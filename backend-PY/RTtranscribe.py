@@ -6,6 +6,7 @@ Install: pip install faster-whisper sounddevice numpy
 
 import sounddevice as sd
 import numpy as np
+import os
 import queue
 import threading
 import time
@@ -107,8 +108,9 @@ class StreamingTranscriber:
         
         if USE_FASTER_WHISPER:
             # faster-whisper is much more efficient
-            # float16 for GPU is optimal (faster than float32, accurate enough)
-            compute_type = "int8" if device == "cpu" else "float16"
+            # On GPU, int8 weights with float16 activations use half the weight
+            # memory of float16 with near-identical accuracy
+            compute_type = "int8" if device == "cpu" else "int8_float16"
 
             # Try loading with local_files_only first, then try downloading
             try:
@@ -144,6 +146,7 @@ class StreamingTranscriber:
         # Buffers and queues
         self.audio_queue = queue.Queue()
         self.audio_buffer = []
+        self.buffer_samples = 0  # running length of audio_buffer
         self.text_buffer = []
         
         # State
@@ -262,6 +265,7 @@ class StreamingTranscriber:
                 
                 # Add to buffer
                 self.audio_buffer.append(audio_chunk)
+                self.buffer_samples += len(audio_chunk)
                 
                 # Check energy
                 energy = self.get_energy(audio_chunk)
@@ -275,9 +279,8 @@ class StreamingTranscriber:
                     if self.speech_detected:
                         silence_duration = time.time() - self.last_speech_time
                 
-                # Get buffer size
-                total_samples = sum(len(chunk) for chunk in self.audio_buffer)
-                buffer_duration = total_samples / self.sample_rate
+                # Get buffer size (kept as a running count instead of re-summing every block)
+                buffer_duration = self.buffer_samples / self.sample_rate
                 
                 # Decide when to transcribe
                 should_transcribe = False
@@ -306,6 +309,7 @@ class StreamingTranscriber:
                     
                     # Clear buffer
                     self.audio_buffer = []
+                    self.buffer_samples = 0
                     self.speech_detected = False
                     silence_duration = 0
                     
@@ -379,8 +383,9 @@ class StreamingTranscriber:
 def main():
     # Configuration
     CONFIG = {
-        "model_name": "large-v3",  # tiny, base, small, medium, large-v2, large-v3
-                                   # large-v3 = best accuracy for bilingual
+        "model_name": os.getenv("WHISPER_MODEL", "large-v3-turbo"),
+                                   # tiny, base, small, medium, large-v2, large-v3, large-v3-turbo
+                                   # large-v3-turbo = large-v3 accuracy for bilingual with a much faster decoder
         "sample_rate": 16000,      # Whisper uses 16kHz
         "chunk_duration": 3,       # Process every 3 seconds (longer = more context)
         "silence_threshold": 0.01,  # Adjust for your mic sensitivity
@@ -8,7 +8,7 @@ Includes routes for:
 from fastapi import APIRouter, HTTPException, UploadFile, File, Request, status
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, field_validator
 from typing import List, Dict, Optional, Any
 import json
 
@@ -69,7 +69,8 @@ class QuestionGenerationRequest(BaseModel):
     skills: List[Any]  # Accept both strings and dicts
     max_questions: Optional[int] = 8  # Maximum number of questions (default 8 for 5-min interview)
 
-    @validator('skills', pre=True)
+    @field_validator('skills', mode='before')
+    @classmethod
     def normalize_skills(cls, v):
         """
         Normalize skills to always be List[Dict[str, str]]
@@ -106,7 +107,8 @@ class SkillDetectionRequest(BaseModel):
     transcribed_text: str
     timestamp: Optional[str] = None
 
-    @validator('skills', pre=True)
+    @field_validator('skills', mode='before')
+    @classmethod
     def normalize_skills(cls, v):
         """
         Normalize skills to always be List[Dict[str, str]]
@@ -16,18 +16,18 @@ Endpoints:
 - GET  /interview-room/health - Health check
 """
 
-import os
+import io
 import time
 import json
-import shutil
 import logging
-import uuid
 from typing import List, Dict, Optional
 from datetime import datetime
 
 from fastapi import APIRouter, File, UploadFile, Form, HTTPException
 from pydantic import BaseModel
 
+from transcription import SHORT_ANSWER_OPTIONS, transcribe_async
+
 # Import shared Whisper model and Ollama client from main.py
 # These will be injected when router is included
 logger = logging.getLogger(__name__)
@@ -89,7 +89,7 @@ async def transcribe_and_analyze(
     Transcribe audio and analyze if the response correctly answers the question
     
     **Process:**
-    1. Save uploaded audio temporarily
+    1. Read uploaded audio into memory
     2. Transcribe with Whisper (bilingual English/Spanish)
     3. Clean transcript with Ollama Mistral
     4. Analyze response for keywords using Ollama
@@ -124,20 +124,15 @@ async def transcribe_and_analyze(
     logger.info(f"[Interview Room] Expected keywords: {expected_keywords}")
     logger.info(f"[Interview Room] Audio file: {audio_file.filename}")
     
-    temp_audio_path = None
-    
     try:
         # ===========================
-        # Step 1: Save Audio File
+        # Step 1: Read Audio
         # ===========================
-        temp_audio_path = f"temp_interview_room_{uuid.uuid4()}.webm"
-        
-        logger.info(f"[Interview Room] Saving audio to: {temp_audio_path}")
-        with open(temp_audio_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+        # faster-whisper decodes file-like objects, so no temp file is needed
+        audio_data = await audio_file.read()
         
-        file_size = os.path.getsize(temp_audio_path)
-        logger.info(f"[Interview Room] ✓ Audio saved ({file_size} bytes)")
+        file_size = len(audio_data)
+        logger.info(f"[Interview Room] ✓ Audio received ({file_size} bytes)")
         
         if file_size == 0:
             logger.error("[Interview Room] X - Audio file is empty!")
@@ -155,14 +150,14 @@ async def transcribe_and_analyze(
         logger.info("[Interview Room] Step 1: Transcribing with Whisper...")
         start_time = time.time()
         
-        segments, info = whisper_model.transcribe(
-            temp_audio_path,
-            beam_size=5,
+        # Runs on the shared Whisper thread so the event loop stays responsive
+        transcript, info = await transcribe_async(
+            whisper_model,
+            io.BytesIO(audio_data),
             task="transcribe",
-            language=None  # Auto-detect English/Spanish
+            language=None,  # Auto-detect English/Spanish
+            **SHORT_ANSWER_OPTIONS
         )
-        
-        transcript = " ".join([s.text for s in segments]).strip()
         transcription_time = time.time() - start_time
         
         language = info.language if hasattr(info, 'language') else "unknown"
@@ -372,15 +367,6 @@ Analyze this response and return JSON evaluation following the exact format spec
             status_code=500,
             detail=f"Error analyzing response: {str(e)}"
         )
-        
-    finally:
-        # Clean up temp file
-        if temp_audio_path and os.path.exists(temp_audio_path):
-            try:
-                os.remove(temp_audio_path)
-                logger.info(f"[Interview Room] 🧹 Cleaned up: {temp_audio_path}")
-            except Exception as cleanup_error:
-                logger.warning(f"[Interview Room] ⚠️ Cleanup failed: {cleanup_error}")
 
 
 @router.get("/health")
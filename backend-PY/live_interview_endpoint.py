@@ -5,7 +5,10 @@ Live Interview Endpoint - Runs skill_interview.py and streams output to frontend
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
 from typing import Dict, Optional
 import asyncio
+import contextlib
+import os
 import subprocess
+import tempfile
 import logging
 import json
 import uuid
@@ -17,6 +20,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/live-interview", tags=["Live Interview"])
 
+# Job description files go to RAM-backed /dev/shm when it exists
+TEMP_DIR = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+
 # Active interview processes
 active_interviews: Dict[str, subprocess.Popen] = {}
 
@@ -89,13 +95,13 @@ async def live_interview_websocket(websocket: WebSocket, job_id: str):
             }
         })
 
-        # Write job description to temp file
-        import tempfile
-        import os
-
-        temp_job_file = f"temp_job_{session_id}.txt"
-        with open(temp_job_file, 'w', encoding='utf-8') as f:
+        # Write job description to temp file (kept until the subprocess exits)
+        with tempfile.NamedTemporaryFile(
+            'w', encoding='utf-8', dir=TEMP_DIR,
+            prefix=f"temp_job_{session_id}_", suffix=".txt", delete=False
+        ) as f:
             f.write(job_description)
+        temp_job_file = f.name
 
         logger.info(f"[Session {session_id}] Starting skill_interview.py...")
 
@@ -173,7 +179,7 @@ async def live_interview_websocket(websocket: WebSocket, job_id: str):
                 process.terminate()
                 process.wait(timeout=5)
 
-            if os.path.exists(temp_job_file):
+            with contextlib.suppress(FileNotFoundError):
                 os.remove(temp_job_file)
 
     except WebSocketDisconnect:
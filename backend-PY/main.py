@@ -1,9 +1,9 @@
-from fastapi import FastAPI, UploadFile, File, Request, status, HTTPException
+from fastapi import FastAPI, Request, status, HTTPException
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
 from database import supabase
-import shutil
+import importlib.util
 import os
 import warnings
 import uuid
@@ -11,21 +11,27 @@ import uuid
 # Suppress ctranslate2 pkg_resources deprecation warning
 warnings.filterwarnings("ignore", message=".*pkg_resources is deprecated.*")
 
-from faster_whisper import WhisperModel
+# transcription sets OMP_NUM_THREADS, so it must be imported before ctranslate2
+from transcription import DECODE_POOL, TRANSCRIBE_POOL, SHORT_ANSWER_OPTIONS, WHISPER_CPU_THREADS, decode_async, transcribe_text
+
+from faster_whisper import WhisperModel, BatchedInferencePipeline
+import ctranslate2
 from fastapi.middleware.cors import CORSMiddleware
-import json
-import bcrypt
 import asyncio
 from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+from datetime import datetime
 import logging
 import time
-import base64
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+import numpy as np
+from cachetools import LRUCache, TTLCache
+import hashlib
+import io
 
 # Import AI routes and classes
 from ai_routes import router as ai_router
-from skill_interview import OllamaClient, SkillAnalyzer
+from skill_interview import OllamaClient, SkillAnalyzer, CLEANUP_AND_DETECT_SYSTEM_PROMPT, cleanup_and_detect_prompt
 from simple_interview_endpoint import router as simple_interview_router
 from live_interview_endpoint import router as live_interview_router
 from interview_room import router as interview_room_router, set_models as set_interview_room_models
@@ -33,77 +39,44 @@ from routers.applications_router import router as applications_router
 
 # Configure logging
 logging.basicConfig(
-    level=logging.INFO,
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
     format='[%(asctime)s] [%(levelname)s] %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 logger = logging.getLogger(__name__)
 
-# Try to import TTS library (gTTS for Google Text-to-Speech)
-try:
-    from gtts import gTTS
-    import io
-    TTS_AVAILABLE = True
-    logger_tts = logging.getLogger("gtts")
-    logger_tts.setLevel(logging.WARNING)  # Reduce gTTS logging
-except ImportError:
-    TTS_AVAILABLE = False
+# Check for the TTS library (gTTS for Google Text-to-Speech)
+TTS_AVAILABLE = importlib.util.find_spec("gtts") is not None
+if TTS_AVAILABLE:
+    logging.getLogger("gtts").setLevel(logging.WARNING)  # Reduce gTTS logging
+else:
     logger.warning("gTTS not installed. Install with: pip install gTTS")
 
-# Audio conversion utility
-def convert_to_wav(input_path: str, output_path: str) -> bool:
-    """
-    Convert audio file to WAV format using ffmpeg
-    Returns True if successful, False otherwise
-    """
-    try:
-        logger.info(f"Converting {input_path} to WAV format...")
-
-        # Use ffmpeg to convert to 16kHz mono WAV (optimal for Whisper)
-        command = [
-            'ffmpeg',
-            '-loglevel', 'error',  # Only show errors
-            '-i', input_path,
-            '-ar', '16000',  # 16kHz sample rate
-            '-ac', '1',      # Mono
-            '-y',            # Overwrite output file
-            output_path
-        ]
-
-        result = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            timeout=30
-        )
-
-        if result.returncode == 0:
-            logger.info(f"✓ Audio converted successfully to {output_path}")
-            return True
-        else:
-            logger.error(f"FFmpeg conversion failed: {result.stderr.decode()}")
-            return False
-
-    except FileNotFoundError:
-        logger.error("❌ FFmpeg not found! Please install: 'choco install ffmpeg' or 'apt-get install ffmpeg'")
-        return False
-    except subprocess.TimeoutExpired:
-        logger.error("❌ Audio conversion timed out (>30s)")
-        return False
-    except Exception as e:
-        logger.error(f"❌ Audio conversion error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
 from routers.jobs_router import router as jobs_router
-from routers.applications_router import router as applications_router # Import the new router
 from routers import inbox_router
-from resumeAI import ResumeAI
 from resume_router import router as resume_router, set_models as set_resume_models
+from resume_creator_router import router as resume_creator_router, resume_store
+from storage import ResponseStore, normalize_phone
+
+# --- Persistent Data Storage (SQLite, WAL mode) ---
+response_store = ResponseStore()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await asyncio.get_running_loop().run_in_executor(TRANSCRIBE_POOL, warm_up_whisper)
+    session_cleanup_task = asyncio.create_task(expire_interview_sessions())
+    yield
+    session_cleanup_task.cancel()
+    response_store.close()
+    await resume_store.stop()
+    DECODE_POOL.shutdown(wait=False)
+    TRANSCRIBE_POOL.shutdown(wait=False)
+    OLLAMA_POOL.shutdown(wait=False)
 
 # --- FastAPI App Initialization ---
-app = FastAPI()
+# Request bodies are validated by Pydantic v2's compiled core; responses are
+# serialized with orjson instead of the stdlib json encoder
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=lifespan)
 
 # --- Global Validation Error Handler ---
 @app.exception_handler(RequestValidationError)
@@ -147,19 +120,54 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         },
     )
 
+# --- Upload Size Limit ---
+# Reject oversized bodies from the Content-Length header before they are read
+MAX_UPLOAD_BYTES = 10 * 1024 * 1024
+
+@app.middleware("http")
+async def limit_upload_size(request: Request, call_next):
+    content_length = request.headers.get("content-length")
+    if content_length and content_length.isdigit() and int(content_length) > MAX_UPLOAD_BYTES:
+        return JSONResponse(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            content={"detail": f"Upload too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)"},
+        )
+    return await call_next(request)
+
+async def read_audio_body(request: Request) -> bytes:
+    """
+    Read an uploaded answer recording
+
+    Raw audio bodies (Content-Type audio/* or application/octet-stream) are
+    streamed straight into one buffer, capped at MAX_UPLOAD_BYTES even for
+    chunked requests without a Content-Length. Multipart forms with an
+    `audio_file` field are still accepted for older clients.
+    """
+    if request.headers.get("content-type", "").startswith("multipart/form-data"):
+        form = await request.form()
+        upload = form.get("audio_file")
+        if upload is None or isinstance(upload, str):
+            raise HTTPException(status_code=422, detail="Missing 'audio_file' upload")
+        return await upload.read()
+
+    buffer = bytearray()
+    async for chunk in request.stream():
+        buffer.extend(chunk)
+        if len(buffer) > MAX_UPLOAD_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Upload too large (max {MAX_UPLOAD_BYTES // (1024 * 1024)} MB)",
+            )
+    return bytes(buffer)
+
 app.include_router(inbox_router.router)
 
-origins = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-    "http://localhost:5174",
-    "http://127.0.0.1:5174",
-    "http://localhost:5175",
-    "http://127.0.0.1:5175",
-]
+# Vite dev servers on localhost/127.0.0.1, ports 5173-5175. Starlette compiles
+# the regex once and matches each Origin header with a single fullmatch
+ALLOWED_ORIGIN_REGEX = r"http://(localhost|127\.0\.0\.1):517[345]"
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=origins,
+    allow_origin_regex=ALLOWED_ORIGIN_REGEX,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -173,12 +181,14 @@ app.include_router(simple_interview_router)
 app.include_router(live_interview_router)
 app.include_router(interview_room_router)
 app.include_router(resume_router)
+app.include_router(resume_creator_router)
 app.include_router(applications_router)
 print("[OK] AI routes registered at /ai")
 print("[OK] Simple interview routes registered at /simple-interview")
 print("[OK] Live interview routes registered at /live-interview")
 print("[OK] Interview room routes registered at /interview-room")
 print("[OK] Resume routes registered at /resume")
+logger.info("[OK] Resume creator routes registered at /generate_resume, /save_resume")
 print("[OK] Interview room routes registered at /live-interview")
 print("[OK] Jobs Router routes registered at /applications-router")
 
@@ -187,16 +197,70 @@ logger.info("="*60)
 logger.info("INITIALIZING AI MODELS")
 logger.info("="*60)
 
+# Whisper runs on the GPU when CTranslate2 can see one (override with
+# WHISPER_DEVICE=cpu|cuda). On GPU, int8 weights with float16 activations
+# halve weight memory compared to plain float16.
+# WHISPER_MODEL may also point at a pre-quantized CTranslate2 checkpoint
+# (ct2-transformers-converter --quantization int8).
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "base")
+WHISPER_DEVICE = os.getenv("WHISPER_DEVICE") or ("cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu")
+WHISPER_COMPUTE_TYPE = "int8_float16" if WHISPER_DEVICE == "cuda" else "int8"
+
 # Load faster-whisper base model (faster and lighter)
-logger.info("Loading faster-whisper 'base' model...")
-logger.info("Device: CPU | Compute Type: int8")
-model = WhisperModel("base", device="cpu", compute_type="int8")
-logger.info("✅ faster-whisper-base model loaded successfully")
+logger.info(f"Loading faster-whisper '{WHISPER_MODEL}' model...")
+logger.info(f"Device: {WHISPER_DEVICE.upper()} | Compute Type: {WHISPER_COMPUTE_TYPE} | CPU threads: {WHISPER_CPU_THREADS}")
+model = WhisperModel(
+    WHISPER_MODEL,
+    device=WHISPER_DEVICE,
+    compute_type=WHISPER_COMPUTE_TYPE,
+    cpu_threads=WHISPER_CPU_THREADS,
+    num_workers=1  # transcriptions are serialized on TRANSCRIBE_POOL
+)
+logger.info(f"✅ faster-whisper '{WHISPER_MODEL}' model loaded successfully")
+
+# Batched decoding of VAD-split chunks (faster-whisper >= 1.1)
+WHISPER_BATCH_SIZE = 8
+batched_model = BatchedInferencePipeline(model=model)
+
+# Set WHISPER_LANGUAGE (e.g. "en") to skip language auto-detection in interviews
+WHISPER_LANGUAGE = os.getenv("WHISPER_LANGUAGE") or None
+
+# Questionnaire answers are short English-only clips, so they use a smaller
+# English-specialized model instead of the shared bilingual one
+logger.info("Loading faster-whisper 'tiny.en' model for questionnaire answers...")
+qa_model = WhisperModel(
+    "tiny.en",
+    device=WHISPER_DEVICE,
+    compute_type=WHISPER_COMPUTE_TYPE,
+    cpu_threads=WHISPER_CPU_THREADS,
+    num_workers=1
+)
+qa_batched_model = BatchedInferencePipeline(model=qa_model)
+logger.info("✅ faster-whisper-tiny.en model loaded successfully")
+
+WHISPER_SAMPLE_RATE = 16000
+
+# Transcripts of recent interview answers keyed by a hash of the uploaded
+# bytes, so a client retrying the same recording skips Whisper entirely
+TRANSCRIPT_CACHE: LRUCache = LRUCache(maxsize=256)
+
+# Ollama calls are blocking HTTP requests; a separate pool lets one session's
+# LLM call overlap another session's transcription
+OLLAMA_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="ollama")
+
+def warm_up_whisper():
+    """Run one second of silence through each model so the first real request skips kernel setup"""
+    silence = np.zeros(WHISPER_SAMPLE_RATE, dtype=np.float32)
+    for whisper in (model, qa_model):
+        list(whisper.transcribe(silence, beam_size=1)[0])
+    logger.info("✅ Whisper models warmed up")
 
 # Initialize Ollama client for Mistral
 logger.info("Initializing Ollama client with Mistral model...")
 ollama_client_global = OllamaClient(model="mistral:7b")
 if ollama_client_global.check_connection():
+    # Load Mistral now (pinned with keep_alive=-1) instead of on the first answer
+    ollama_client_global.warm_prompt()
     logger.info("✅ Ollama Mistral model ready")
 else:
     logger.warning("⚠️ Ollama not accessible - AI features may not work")
@@ -213,19 +277,6 @@ logger.info("✅ Resume module configured")
 
 logger.info("="*60)
 
-# --- Persistent Data Storage (using a JSON file) ---
-RESPONSES_FILE = "user_responses.json"
-
-def load_responses():
-    if os.path.exists(RESPONSES_FILE):
-        with open(RESPONSES_FILE, "r") as f:
-            return json.load(f)
-    return {"users": []}
-
-def save_responses(responses_data):
-    with open(RESPONSES_FILE, "w") as f:
-        json.dump(responses_data, f, indent=4)
-
 # --- Account Creation ---
 class Account(BaseModel):
     first_name:str
@@ -238,7 +289,8 @@ class Account(BaseModel):
 @app.post("/create-account")
 async def create_account(account: Account):
     print(f"--- Received request to create account for: {account.email} ---")
-    print(f"Data received: {account.dict()}")
+    print(f"Data received: {account.model_dump()}")
+    phone_number = normalize_phone(account.phone_number)
     try:
         auth_response = supabase.auth.sign_up({
             'email': account.email,
@@ -252,12 +304,12 @@ async def create_account(account: Account):
                 'first_name': account.first_name,
                 'last_name': account.last_name,
                 'postal_code': account.postal_code,
-                'phone_number': account.phone_number,
+                'phone_number': phone_number,
             }).eq('id', user_id).execute()
             print(f"Supabase Profile Response: {profile_response}")
             if profile_response.data:
                 print("Profile created successfully.")
-                return {"message": "Account created successfully", "phone_number": account.phone_number}
+                return {"message": "Account created successfully", "phone_number": phone_number}
             else:
                 print("ERROR: Profile creation failed. Rolling back auth user.")
                 supabase.auth.admin.delete_user(user_id)
@@ -288,7 +340,7 @@ async def login(login_data: LoginData):
         print(f"Supabase Auth Response: {auth_response}")
         if auth_response.session:
             print("Login successful.")
-            return {"message": "Login successful", "session": auth_response.session.dict()}
+            return {"message": "Login successful", "session": auth_response.session.model_dump()}
         if auth_response.error:
             print(f"ERROR: Login failed: {auth_response.error.message}")
             return {"error": f"Login failed: {auth_response.error.message}"}
@@ -297,9 +349,14 @@ async def login(login_data: LoginData):
         return {"error": str(e)}
     
 # --- Voice-based Q&A Logic ---
-QUESTIONS = [
+QUESTIONS = (
     "What are your skills?",
-]
+)
+
+def validate_question_id(question_id: int):
+    """Reject question ids outside QUESTIONS with a 400 instead of an IndexError"""
+    if not 0 <= question_id < len(QUESTIONS):
+        raise HTTPException(status_code=400, detail=f"Invalid question id. Must be 0-{len(QUESTIONS) - 1}")
 
 @app.get("/questions")
 async def get_questions():
@@ -311,14 +368,12 @@ class TextInput(BaseModel):
 
 @app.post("/text-input/{phone_number}/{question_id}")
 async def handle_text_input(phone_number: str, question_id: int, text_input: TextInput):
-    responses_data = load_responses()
-    user_entry = next((u for u in responses_data["users"] if u.get("phone_number") == phone_number), None)
-
-    if not user_entry:
+    validate_question_id(question_id)
+    phone_number = normalize_phone(phone_number)
+    if not await asyncio.to_thread(response_store.user_exists, phone_number):
         return {"error": "User not found"}
 
-    user_entry["responses"][QUESTIONS[question_id]] = text_input.text
-    save_responses(responses_data)
+    await asyncio.to_thread(response_store.save_response, phone_number, QUESTIONS[question_id], text_input.text)
 
     next_question_id = question_id + 1
     if next_question_id < len(QUESTIONS):
@@ -330,39 +385,46 @@ async def handle_text_input(phone_number: str, question_id: int, text_input: Tex
     else:
         return {
             "message": "All questions answered",
-            "responses": user_entry["responses"],
+            "responses": await asyncio.to_thread(response_store.get_responses, phone_number),
         }
 
-@app.post("/voice-input/{phone_number}/{question_id}")
-async def handle_voice_input(phone_number: str, question_id: int, audio_file: UploadFile = File(...)):
-    file_path = f"temp_audio_{phone_number}_{question_id}.wav"
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(audio_file.file, buffer)
+# Questionnaire answers are short; longer clips are rejected before transcription
+MAX_ANSWER_SECONDS = 30
 
-    # Use faster-whisper's transcribe method (returns segments and info)
-    segments, info = model.transcribe(file_path, beam_size=5)
-    
-    # Combine all segments into a single transcription
-    transcribed_text = " ".join([segment.text for segment in segments]).strip()
-    print(f"User '{phone_number}' | Q{question_id} | Transcribed: '{transcribed_text}'")
+@app.post("/voice-input/{phone_number}/{question_id}")
+async def handle_voice_input(phone_number: str, question_id: int, request: Request):
+    validate_question_id(question_id)
+    phone_number = normalize_phone(phone_number)
 
-    os.remove(file_path)
+    # Decode once up front (16kHz mono float32) so the duration can be checked
+    # and Whisper does not decode the file a second time. The upload is size-capped,
+    # so it is decoded from memory without a temp file
+    audio_data = await read_audio_body(request)
+    audio = await decode_async(io.BytesIO(audio_data), WHISPER_SAMPLE_RATE)
 
-    responses_data = load_responses()
-    user_entry = next((u for u in responses_data["users"] if u.get("phone_number") == phone_number), None)
+    duration = len(audio) / WHISPER_SAMPLE_RATE
+    if duration > MAX_ANSWER_SECONDS:
+        return {"error": f"Audio too long ({duration:.0f}s). Please keep answers under {MAX_ANSWER_SECONDS} seconds."}
 
-    # Create user if they don't exist (for guest users)
-    if not user_entry:
-        print(f"[Voice Input] Creating guest user: {phone_number}")
-        user_entry = {
-            "phone_number": phone_number,
-            "responses": {}
-        }
-        responses_data["users"].append(user_entry)
+    # Use faster-whisper's transcribe method (returns segments and info)
+    # Language is fixed to skip detection; each answer is a one-shot clip
+    # so there is no previous text worth conditioning on
+    transcribed_text, info = await asyncio.get_running_loop().run_in_executor(
+        TRANSCRIBE_POOL,
+        lambda: transcribe_text(
+            qa_batched_model,
+            audio,
+            batch_size=WHISPER_BATCH_SIZE,
+            language="en",
+            task="transcribe",
+            **SHORT_ANSWER_OPTIONS
+        )
+    )
+    print(f"User '{phone_number}' | Q{question_id} | Transcribed: '{transcribed_text}'")
 
-    # Save the transcription (use question_id as key for interview questions)
-    user_entry["responses"][f"Q{question_id}"] = transcribed_text
-    save_responses(responses_data)
+    # Save the transcription (use question_id as key for interview questions).
+    # Guest users get their first row here, no separate account entry is needed
+    await asyncio.to_thread(response_store.save_response, phone_number, f"Q{question_id}", transcribed_text)
 
     next_question_id = question_id + 1
     if next_question_id < len(QUESTIONS):
@@ -375,11 +437,29 @@ async def handle_voice_input(phone_number: str, question_id: int, audio_file: Up
     else:
         return {
             "message": "All questions answered",
-            "responses": user_entry["responses"],
+            "responses": await asyncio.to_thread(response_store.get_responses, phone_number),
             "transcribed_text": transcribed_text,
         }
 
 # --- Simplified Interview Session Manager ---
+
+# Initial skill_status layouts, keyed by the (skill, category) pairs of a skill list.
+# Many sessions are started for the same job, so the layout is built once per job
+# (bounded, so a long-running server doesn't keep one per job posting forever)
+_SKILL_TEMPLATE_CACHE: LRUCache = LRUCache(maxsize=128)
+
+def new_skill_status(skills: List[Dict]) -> Dict[str, Dict]:
+    """Fresh skill_status dict for a session (each skill gets its own detected_in list)"""
+    key = tuple((s["skill"], s.get("category", "General")) for s in skills)
+    template = _SKILL_TEMPLATE_CACHE.get(key)
+    if template is None:
+        template = {
+            skill_name: {"has": False, "detected_in": None, "category": category}
+            for skill_name, category in key
+        }
+        _SKILL_TEMPLATE_CACHE[key] = template
+    return {name: {**status, "detected_in": []} for name, status in template.items()}
+
 class SimpleInterviewSession:
     """
     Simplified interview session using request/response pattern (like questionnaire)
@@ -398,24 +478,23 @@ class SimpleInterviewSession:
     No WebSocket, no timers, no complexity!
     """
 
-    def __init__(self, session_id: str, skills: List[Dict], questions: List[str]):
+    def __init__(self, session_id: str, skills: List[Dict], questions: List[str], ollama_client: Optional[OllamaClient] = None):
         self.session_id = session_id
         self.skills = skills
         self.questions = questions
 
-        # AI components
-        self.ollama_client = OllamaClient(model="mistral:7b")
+        # AI components (sessions share the global client and its open connections)
+        self.ollama_client = ollama_client or ollama_client_global
         self.skill_analyzer = SkillAnalyzer(self.ollama_client)
         self.skill_analyzer.skills = skills
 
         # Initialize skill status
-        for skill_item in skills:
-            skill_name = skill_item["skill"]
-            self.skill_analyzer.skill_status[skill_name] = {
-                "has": False,
-                "detected_in": [],
-                "category": skill_item.get("category", "General")
-            }
+        self.skill_analyzer.skill_status = new_skill_status(skills)
+
+        # Detected skills as a bitmask (one bit per skill) for cheap progress checks
+        self._skill_bit = {s["skill"]: i for i, s in enumerate(skills)}
+        self._skill_mask = 0
+        self._all_skills_mask = sum(1 << i for i in self._skill_bit.values())
 
         # Session state
         self.answers: List[Dict] = []  # {"question_index": 0, "transcript": "...", "detected_skills": [...]}
@@ -427,107 +506,111 @@ class SimpleInterviewSession:
         logger.info(f"[Session {session_id}]   Skills: {len(skills)}")
         logger.info(f"[Session {session_id}]   Questions: {len(questions)}")
 
-    def process_answer(self, question_index: int, audio_file_path: str) -> Dict:
+    async def process_answer(self, question_index: int, audio_data: bytes) -> Dict:
         """
         Process answer for a question
         Returns: {"transcript", "detected_skills", "progress", "next_question"}
         """
-        logger.info(f"[Session {self.session_id}] ==========================================")
-        logger.info(f"[Session {self.session_id}] PROCESS_ANSWER METHOD")
-        logger.info(f"[Session {self.session_id}] ==========================================")
-        logger.info(f"[Session {self.session_id}] Processing answer for Q{question_index + 1}")
-        logger.info(f"[Session {self.session_id}] Audio file: {audio_file_path}")
-
-        # Check audio file exists and has content
-        if not os.path.exists(audio_file_path):
-            logger.error(f"[Session {self.session_id}] ❌ Audio file not found: {audio_file_path}")
-            raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+        logger.info("[Session %s] Processing answer for Q%d (%d bytes)", self.session_id, question_index + 1, len(audio_data))
+        # Wall-clock time of the answer, formatted once for the answer record
+        timestamp = datetime.now().strftime("%H:%M:%S")
 
-        file_size = os.path.getsize(audio_file_path)
-        logger.info(f"[Session {self.session_id}] Audio file size: {file_size} bytes")
-
-        if file_size == 0:
+        # Check audio has content
+        if not audio_data:
             logger.error(f"[Session {self.session_id}] ❌ Audio file is empty")
             raise ValueError("Audio file is empty")
 
         try:
-            # Transcribe with bilingual support (faster-whisper handles webm natively via ffmpeg)
-            logger.info(f"[Session {self.session_id}] Step 1: Transcribing with faster-whisper (bilingual)...")
-            logger.info(f"[Session {self.session_id}]   Audio format: {audio_file_path.split('.')[-1]}")
-            start_time = time.time()
-
-            segments, info = model.transcribe(
-                audio_file_path,
-                beam_size=5,
-                task="transcribe",
-                language=None  # Auto-detect English/Spanish
-            )
-
-            transcript = " ".join([s.text for s in segments]).strip()
-            transcription_time = time.time() - start_time
+            # Transcribe with bilingual support (webm is decoded in-process with PyAV)
+            logger.debug("[Session %s] Step 1: Transcribing with faster-whisper (bilingual)...", self.session_id)
+            t = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            skill_names = [f"{s['skill']} ({s.get('category', 'General')})" for s in self.skills]
+            # Once every skill is confirmed there is nothing left for Mistral to decide
+            skills_pending = self._skill_mask != self._all_skills_mask
+
+            def warm_llm(first_segment):
+                if not skills_pending:
+                    return
+                # Load Mistral and prefill the prompt prefix while Whisper finishes the rest
+                prompt = cleanup_and_detect_prompt(first_segment.text.strip(), skill_names)
+                OLLAMA_POOL.submit(self.ollama_client.warm_prompt, prompt, CLEANUP_AND_DETECT_SYSTEM_PROMPT)
+
+            cache_key = (hashlib.blake2b(audio_data, digest_size=16).digest(), WHISPER_LANGUAGE)
+            cached = TRANSCRIPT_CACHE.get(cache_key)
+            if cached is not None:
+                logger.debug("[Session %s] Reusing cached transcript for resubmitted audio", self.session_id)
+                transcript, info = cached
+            else:
+                # Decode on DECODE_POOL, then transcribe on the shared Whisper
+                # thread; another answer can decode while this one transcribes
+                audio = await decode_async(io.BytesIO(audio_data), WHISPER_SAMPLE_RATE)
+                transcript, info = await loop.run_in_executor(
+                    TRANSCRIBE_POOL,
+                    lambda: transcribe_text(
+                        batched_model,
+                        audio,
+                        on_first_segment=warm_llm,
+                        batch_size=WHISPER_BATCH_SIZE,
+                        task="transcribe",
+                        language=WHISPER_LANGUAGE,  # None auto-detects English/Spanish
+                        **SHORT_ANSWER_OPTIONS
+                    )
+                )
+                TRANSCRIPT_CACHE[cache_key] = (transcript, info)
+            transcription_time = time.perf_counter() - t
 
             detected_language = info.language if hasattr(info, 'language') else "unknown"
             language_confidence = info.language_probability if hasattr(info, 'language_probability') else 0.0
 
-            timestamp = datetime.now().strftime("%H:%M:%S")
-
-            logger.info(f"[Session {self.session_id}] ✅ Transcription complete ({transcription_time:.2f}s)")
-            logger.info(f"[Session {self.session_id}] [{timestamp}] Language: {detected_language.upper()} ({language_confidence:.0%})")
-            logger.info(f"[Session {self.session_id}] [{timestamp}] Transcript: \"{transcript}\"")
-            logger.info(f"[Session {self.session_id}] Transcript length: {len(transcript)} characters")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[Session {self.session_id}] ✅ Transcription complete ({transcription_time:.2f}s)")
+                logger.debug(f"[Session {self.session_id}] [{timestamp}] Language: {detected_language.upper()} ({language_confidence:.0%})")
+                logger.debug(f"[Session {self.session_id}] [{timestamp}] Transcript: \"{transcript}\"")
 
             if not transcript:
                 logger.warning(f"[Session {self.session_id}] ⚠️ Transcription is empty!")
 
-            # Clean transcription
-            logger.info(f"[Session {self.session_id}] Step 2: Cleaning transcription with Mistral...")
-            start_time = time.time()
-
-            cleaned_transcript = self.ollama_client.cleanup_transcription(transcript)
-            cleanup_time = time.time() - start_time
-
-            logger.info(f"[Session {self.session_id}] ✅ Cleanup complete ({cleanup_time:.2f}s)")
+            # Clean transcription and detect skills in one Mistral call
+            logger.debug("[Session %s] Step 2: Cleaning transcription and analyzing for skills with Mistral...", self.session_id)
+            t = time.perf_counter()
 
-            if cleaned_transcript != transcript:
-                logger.info(f"[Session {self.session_id}] ✓ Transcription cleaned")
-                logger.info(f"[Session {self.session_id}]   Original:  {transcript}")
-                logger.info(f"[Session {self.session_id}]   Corrected: {cleaned_transcript}")
+            if skills_pending:
+                llm_result = await loop.run_in_executor(
+                    OLLAMA_POOL,
+                    self.ollama_client.cleanup_and_detect,
+                    transcript,
+                    skill_names
+                )
             else:
-                logger.info(f"[Session {self.session_id}] No cleanup changes needed")
-
-            # Detect skills
-            logger.info(f"[Session {self.session_id}] Step 3: Analyzing for skills with Mistral...")
-            start_time = time.time()
-
-            detected_skills = self.skill_analyzer.detect_skills_in_text(
-                transcript,
+                logger.debug("[Session %s] All skills already detected, skipping Mistral", self.session_id)
+                llm_result = {"cleaned": transcript, "skills": []}
+            cleaned_transcript = llm_result["cleaned"]
+            detected_skills = self.skill_analyzer.record_detected_skills(
+                llm_result["skills"],
                 timestamp,
-                cleaned_text=cleaned_transcript
+                transcript
             )
+            for skill_name in detected_skills:
+                bit = self._skill_bit.get(skill_name)
+                if bit is not None:
+                    self._skill_mask |= 1 << bit
 
-            detection_time = time.time() - start_time
-            logger.info(f"[Session {self.session_id}] ✅ Skill detection complete ({detection_time:.2f}s)")
+            llm_time = time.perf_counter() - t
 
-            if detected_skills:
-                logger.info(f"[Session {self.session_id}] ✅ Detected {len(detected_skills)} skill(s):")
-                for skill in detected_skills:
-                    logger.info(f"[Session {self.session_id}]    ✓ {skill}")
-            else:
-                logger.info(f"[Session {self.session_id}] No skills detected in this answer")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"[Session {self.session_id}] ✅ Cleanup and skill detection complete ({llm_time:.2f}s)")
+                if cleaned_transcript != transcript:
+                    logger.debug(f"[Session {self.session_id}]   Original:  {transcript}")
+                    logger.debug(f"[Session {self.session_id}]   Corrected: {cleaned_transcript}")
+                logger.debug(f"[Session {self.session_id}]   Detected skills: {detected_skills}")
 
             # Calculate progress
-            logger.info(f"[Session {self.session_id}] Step 4: Calculating progress...")
             total_skills = len(self.skills)
-            detected_count = sum(
-                1 for status in self.skill_analyzer.skill_status.values()
-                if status["has"]
-            )
+            detected_count = self._skill_mask.bit_count()
             progress = (detected_count / total_skills * 100) if total_skills > 0 else 0
 
-            logger.info(f"[Session {self.session_id}] 📊 Progress: {detected_count}/{total_skills} skills ({progress:.0%})")
-
             # Save answer
-            logger.info(f"[Session {self.session_id}] Step 5: Saving answer data...")
             answer_data = {
                 "question_index": question_index,
                 "question": self.questions[question_index],
@@ -539,19 +622,13 @@ class SimpleInterviewSession:
                 "timestamp": timestamp
             }
             self.answers.append(answer_data)
-            logger.info(f"[Session {self.session_id}] ✓ Answer saved (total answers: {len(self.answers)})")
 
             # Check if we have more questions
             next_question_index = question_index + 1
             has_next = next_question_index < len(self.questions)
 
             # Check if all skills detected
-            all_skills_detected = (detected_count == total_skills)
-
-            logger.info(f"[Session {self.session_id}] Step 6: Preparing response...")
-            logger.info(f"[Session {self.session_id}]   Has next question: {has_next}")
-            logger.info(f"[Session {self.session_id}]   Next question index: {next_question_index if has_next else None}")
-            logger.info(f"[Session {self.session_id}]   All skills detected: {all_skills_detected}")
+            all_skills_detected = self._skill_mask == self._all_skills_mask
 
             response = {
                 "transcript": cleaned_transcript,
@@ -570,22 +647,18 @@ class SimpleInterviewSession:
                 )
             }
 
-            logger.info(f"[Session {self.session_id}] ✅ Response prepared")
-            logger.info(f"[Session {self.session_id}] ==========================================")
+            # %-style arguments are only formatted if INFO is enabled
+            logger.info(
+                "[Session %s] ✅ Q%d processed: %d skill(s) detected, progress %d/%d "
+                "(whisper %.2fs, mistral %.2fs)",
+                self.session_id, question_index + 1, len(detected_skills), detected_count,
+                total_skills, transcription_time, llm_time
+            )
 
             return response
 
         except Exception as e:
-            logger.error(f"[Session {self.session_id}] ==========================================")
-            logger.error(f"[Session {self.session_id}] ❌ ERROR IN PROCESS_ANSWER")
-            logger.error(f"[Session {self.session_id}] ==========================================")
-            logger.error(f"[Session {self.session_id}] Error type: {type(e).__name__}")
-            logger.error(f"[Session {self.session_id}] Error message: {str(e)}")
-            import traceback
-            logger.error(f"[Session {self.session_id}] Traceback:")
-            for line in traceback.format_exc().split('\n'):
-                logger.error(f"[Session {self.session_id}]   {line}")
-            logger.error(f"[Session {self.session_id}] ==========================================")
+            logger.exception(f"[Session {self.session_id}] ❌ Error processing answer: {type(e).__name__}: {e}")
             raise
 
     def get_report(self) -> Dict:
@@ -611,8 +684,22 @@ class SimpleInterviewSession:
             "session_id": self.session_id
         }
 
-# Store active interview sessions (in-memory)
-interview_sessions: Dict[str, SimpleInterviewSession] = {}
+# Store active interview sessions (in-memory). Sessions are dropped after
+# SESSION_TTL_SECONDS without an answer, or least-recently-used first once
+# MAX_SESSIONS are open, so abandoned interviews do not accumulate
+MAX_SESSIONS = 512
+SESSION_TTL_SECONDS = 3600
+interview_sessions: TTLCache = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL_SECONDS)
+
+async def expire_interview_sessions(interval: float = 60):
+    """Evict expired sessions even when no requests touch the cache"""
+    while True:
+        await asyncio.sleep(interval)
+        before = len(interview_sessions)
+        interview_sessions.expire()
+        expired = before - len(interview_sessions)
+        if expired:
+            logger.info(f"Expired {expired} idle interview session(s)")
 
 
 # --- REST-based Interview Endpoints (Simple pattern like questionnaire) ---
@@ -699,7 +786,7 @@ async def start_interview(request: InterviewStartRequest):
 async def submit_interview_answer(
     session_id: str,
     question_index: int,
-    audio_file: UploadFile = File(...)
+    request: Request
 ):
     """
     Submit answer for a specific question
@@ -707,88 +794,44 @@ async def submit_interview_answer(
     **Pattern:** Same as /voice-input/{phone_number}/{question_id}
 
     1. Client records answer
-    2. Client posts audio file
+    2. Client posts the audio as the raw request body (multipart still accepted)
     3. Server transcribes (bilingual)
     4. Server detects skills
     5. Server returns: transcript, detected skills, progress, next question
 
     **Early completion:** If all skills detected, interview ends automatically
     """
-    logger.info("="*60)
-    logger.info(f"[Session {session_id}] SUBMIT ANSWER ENDPOINT")
-    logger.info("="*60)
     logger.info(f"[Session {session_id}] Received answer for Q{question_index + 1}")
-    logger.info(f"[Session {session_id}] Audio file info:")
-    logger.info(f"[Session {session_id}]   Filename: {audio_file.filename}")
-    logger.info(f"[Session {session_id}]   Content-Type: {audio_file.content_type}")
-    logger.info(f"[Session {session_id}]   Size: {audio_file.size if hasattr(audio_file, 'size') else 'Unknown'}")
+    logger.debug(f"[Session {session_id}]   Content-Type: {request.headers.get('content-type')}")
 
     # Check session exists
-    if session_id not in interview_sessions:
+    session = interview_sessions.get(session_id)
+    if session is None:
         logger.error(f"[Session {session_id}] ❌ Session not found")
-        logger.error(f"[Session {session_id}] Available sessions: {list(interview_sessions.keys())}")
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = interview_sessions[session_id]
-    logger.info(f"[Session {session_id}] ✓ Session found")
-    logger.info(f"[Session {session_id}]   Total questions: {len(session.questions)}")
-    logger.info(f"[Session {session_id}]   Answers submitted so far: {len(session.answers)}")
+    # Re-insert to restart the session's idle timer
+    interview_sessions[session_id] = session
 
     # Check question index is valid
     if question_index < 0 or question_index >= len(session.questions):
-        logger.error(f"[Session {session_id}] ❌ Invalid question index: {question_index}")
-        logger.error(f"[Session {session_id}] Valid range: 0-{len(session.questions)-1}")
+        logger.error(f"[Session {session_id}] ❌ Invalid question index: {question_index} (valid range: 0-{len(session.questions)-1})")
         raise HTTPException(status_code=400, detail=f"Invalid question index. Must be 0-{len(session.questions)-1}")
 
-    logger.info(f"[Session {session_id}] ✓ Question index valid")
-    logger.info(f"[Session {session_id}] Question: \"{session.questions[question_index]}\"")
+    logger.debug(f"[Session {session_id}] Question: \"{session.questions[question_index]}\"")
 
-    # Save audio file (use webm extension since that's what's being sent)
-    temp_audio_path = f"temp_interview_{session_id}_q{question_index}.webm"
-    logger.info(f"[Session {session_id}] Saving audio to: {temp_audio_path}")
+    # Answers are short clips, so the upload is kept in memory instead of a temp file
+    audio_data = await read_audio_body(request)
 
     try:
-        with open(temp_audio_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
-
-        # Check file was saved
-        file_size = os.path.getsize(temp_audio_path)
-        logger.info(f"[Session {session_id}] ✓ Audio file saved ({file_size} bytes)")
-
-        # Process answer
-        logger.info(f"[Session {session_id}] Calling session.process_answer()...")
-        result = session.process_answer(question_index, temp_audio_path)
-
-        logger.info(f"[Session {session_id}] ✅ Answer processed successfully")
-        logger.info(f"[Session {session_id}] Result preview:")
-        logger.info(f"[Session {session_id}]   Transcript: \"{result.get('transcript', 'N/A')[:100]}...\"")
-        logger.info(f"[Session {session_id}]   Detected skills: {result.get('detected_skills', [])}")
-        logger.info(f"[Session {session_id}]   Progress: {result.get('progress', {})}")
-        logger.info(f"[Session {session_id}]   Has next: {result.get('has_next_question', False)}")
-        logger.info(f"[Session {session_id}]   All detected: {result.get('all_skills_detected', False)}")
-        logger.info("="*60)
-
-        return result
+        # Process answer (logs its own summary)
+        return await session.process_answer(question_index, audio_data)
 
     except Exception as e:
-        logger.error("="*60)
-        logger.error(f"[Session {session_id}] ❌ ERROR PROCESSING ANSWER")
-        logger.error("="*60)
-        logger.error(f"[Session {session_id}] Error type: {type(e).__name__}")
-        logger.error(f"[Session {session_id}] Error message: {str(e)}")
-        import traceback
-        logger.error(f"[Session {session_id}] Traceback:")
-        for line in traceback.format_exc().split('\n'):
-            logger.error(f"[Session {session_id}]   {line}")
-        logger.error("="*60)
+        # process_answer already logged the traceback
+        logger.error(f"[Session {session_id}] ❌ Failed to process answer: {type(e).__name__}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # Clean up temp file
-        if os.path.exists(temp_audio_path):
-            logger.info(f"[Session {session_id}] Cleaning up temp file: {temp_audio_path}")
-            os.remove(temp_audio_path)
-
 @app.post("/interview/complete/{session_id}")
 async def complete_interview(session_id: str):
     """
@@ -803,12 +846,11 @@ async def complete_interview(session_id: str):
     logger.info(f"[Session {session_id}] Completing interview...")
     
     # Check session exists
-    if session_id not in interview_sessions:
+    session = interview_sessions.get(session_id)
+    if session is None:
         logger.error(f"[Session {session_id}] Session not found")
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = interview_sessions[session_id]
-    
     # Generate final report
     final_report = session.get_report()
     
@@ -816,18 +858,17 @@ async def complete_interview(session_id: str):
     logger.info("="*60)
     
     # Clean up session
-    del interview_sessions[session_id]
+    interview_sessions.pop(session_id, None)
     
     return final_report
 
 @app.get("/interview/session/{session_id}")
 async def get_interview_session_info(session_id: str):
     """Get current session info (for debugging)"""
-    if session_id not in interview_sessions:
+    session = interview_sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = interview_sessions[session_id]
-
     return {
         "session_id": session_id,
         "skills": session.skills,
@@ -841,3 +882,17 @@ async def get_interview_session_info(session_id: str):
     }
 
 
+if __name__ == "__main__":
+    import uvicorn
+
+    # "auto" selects uvloop and httptools when installed (uvloop is not
+    # available on Windows). Interview sessions are kept in process memory,
+    # so only raise WEB_CONCURRENCY once they live in shared storage.
+    uvicorn.run(
+        "main:app",
+        host=os.getenv("HOST", "127.0.0.1"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=int(os.getenv("WEB_CONCURRENCY", "1")),
+        loop="auto",
+        http="auto",
+    )
@@ -3,9 +3,13 @@ from EvalPrompt import simple_evaluation_prompt, parser
 
 
 # Initialize Ollama LLM
+# keep_alive=-1 keeps mistral resident between evaluations (same as
+# OllamaClient) and num_ctx caps the KV cache at what the prompt needs
 llm = OllamaLLM(
     model="mistral:7b",
     temperature=0,
+    keep_alive=-1,
+    num_ctx=4096,
 )
 
 # Create evaluation chain using LCEL (LangChain Expression Language)
@@ -13,8 +13,9 @@ Key Features:
 - Accepts JSON data directly (no file path dependencies)
 - Programmatically fills LaTeX template preserving all commands
 - AI enhancement of job accomplishments (optional)
-- Automatic education section removal if no data provided
-- Automatic PDF compilation with pdflatex
+- Sections without data (work, education, certifications) are left out
+- Automatic PDF compilation with pdflatex (or in-process with ReportLab,
+  RESUMEAI_PDF_ENGINE=reportlab)
 - Optional .tex file cleanup (keep only PDF)
 - Proper LaTeX character escaping
 
@@ -42,10 +43,23 @@ Usage Example:
     print(f"PDF: {result['pdf']}")
 """
 
+import asyncio
+import functools
+import hashlib
+import json
 import os
+import re
 import sys
 import subprocess
 import shutil
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from cachetools import LRUCache
+
+import resume_pdf
+import tex_worker
 
 try:
     import ollama
@@ -54,14 +68,223 @@ except ImportError:
     OLLAMA_AVAILABLE = False
     # ollama is only needed for AI enhancement, not for validation/formatting
 
+# Directory holding this module, the template and generated resumes
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# How long Ollama keeps the model loaded after the last request, so
+# consecutive resumes don't each pay the model load time
+OLLAMA_KEEP_ALIVE = "30m"
+
+# Output token budget per accomplishment bullet (one enhanced line), plus a
+# little per job for the [JOB_n] markers in batched replies
+ENHANCE_TOKENS_PER_ITEM = 80
+ENHANCE_TOKENS_PER_JOB = 16
+
+# Context window for enhancement calls. A prompt plus its reply fits in 2048
+# tokens for typical resumes, and a smaller window means a smaller KV cache
+# and faster prompt processing. Raise RESUME_AI_NUM_CTX for long job
+# histories. The value must stay the same for every call, because Ollama
+# reloads the model whenever num_ctx changes.
+ENHANCE_NUM_CTX = int(os.getenv("RESUME_AI_NUM_CTX", "2048"))
+
+# Several jobs are enhanced with one batched prompt by default.
+# RESUMEAI_ENHANCE_BATCH=0 sends each job its own prompt instead, all at once
+# through ollama.AsyncClient. That keeps prompts short and independent, and
+# takes about as long as the slowest job as long as the Ollama server runs
+# with OLLAMA_NUM_PARALLEL >= the number of jobs (otherwise the requests queue).
+ENHANCE_BATCH = os.getenv("RESUMEAI_ENHANCE_BATCH", "1") == "1"
+
+# pdflatex runs once unless LaTeX asks for a rerun; set RESUMEAI_DOUBLE_PASS=1
+# to always run a draft pass followed by the final pass
+PDFLATEX_DOUBLE_PASS = os.getenv("RESUMEAI_DOUBLE_PASS", "0") == "1"
+# LaTeX's rerun warning in the pdflatex log (hyperref's PDF outline warning is
+# ignored; bookmarks don't matter for a one-page resume)
+LATEX_RERUN_RE = re.compile(rb'Label\(s\) may have changed')
+
+# pdflatex can read the document from /dev/stdin, so a .tex that isn't kept is
+# never written to disk
+STREAM_TEX_SOURCE = tex_worker.AVAILABLE
+# Every compile writes its output (.aux, .log, .out and the PDF) into its own
+# scratch directory, on tmpfs where there is one, and only the PDF is moved
+# next to the .tex
+COMPILE_TMP_ROOT = '/dev/shm' if os.path.isdir('/dev/shm') else None
+# How generate_resume makes PDFs: "latex" fills the template and runs
+# pdflatex; "reportlab" draws the same sections in-process (needs reportlab,
+# falls back to LaTeX without it). generate_resume(engine=...) overrides it.
+PDF_ENGINE = os.getenv("RESUMEAI_PDF_ENGINE", "latex")
+# pdflatex passes running at once across all requests (RESUMEAI_PDFLATEX_JOBS,
+# default half the cores); more just slow every compile down
+PDFLATEX_SLOTS = threading.BoundedSemaphore(
+    int(os.getenv("RESUMEAI_PDFLATEX_JOBS", "0")) or max(1, (os.cpu_count() or 2) // 2)
+)
+
+# Job blocks in a batched enhancement reply: [JOB_1] ... [/JOB_1]
+JOB_BLOCK_RE = re.compile(r'\[JOB_(\d+)\](.*?)\[/JOB_\1\]', re.DOTALL)
+
+# Answers that mean "nothing to put on the resume" (compared stripped, lowercased, without trailing periods)
+INVALID_RESPONSES = frozenset(['no', 'none', 'n/a', 'na', 'nothing', '', 'nil', 'null', 'n', 'nope'])
+
+# Interview question keys for each work experience section, in resume order
+JOB_SECTIONS = [
+    {
+        'section': 'work_experience_job1',
+        'company': 'Q6_company', 'location': 'Q7_location', 'title': 'Q8_title',
+        'start_date': 'Q9_start_date', 'end_date': 'Q10_end_date',
+        'accomplishments': ('Q11_accomplishment_1', 'Q12_accomplishment_2', 'Q13_accomplishment_3', 'Q14_accomplishment_4'),
+    },
+    {
+        'section': 'work_experience_job2',
+        'company': 'Q15_company', 'location': 'Q16_location', 'title': 'Q17_title',
+        'start_date': 'Q18_start_date', 'end_date': 'Q19_end_date',
+        'accomplishments': ('Q20_accomplishment_1', 'Q21_accomplishment_2', 'Q22_accomplishment_3'),
+    },
+    {
+        'section': 'work_experience_job3',
+        'company': 'Q23_company', 'location': 'Q24_location', 'title': 'Q25_title',
+        'start_date': 'Q26_start_date', 'end_date': 'Q27_end_date',
+        'accomplishments': ('Q28_accomplishment_1', 'Q29_accomplishment_2'),
+    },
+]
+
+# Certification sections: (section, name, organization, date, details) question keys
+CERT_SECTIONS = [
+    ('certification_1', 'Q39_name', 'Q40_organization', 'Q41_date', 'Q42_details'),
+    ('certification_2', 'Q43_name', 'Q44_organization', 'Q45_date', 'Q46_details'),
+    ('certification_3', 'Q47_name', 'Q48_organization', 'Q49_date', 'Q50_details'),
+    ('certification_4', 'Q51_name', 'Q52_organization', 'Q53_date', 'Q54_details'),
+]
+
+# LaTeX special characters → escaped form. translate() maps each character
+# independently in one pass, so the backslash needs no special ordering.
+LATEX_ESCAPES = str.maketrans({
+    '\\': r'\textbackslash{}',
+    '&': r'\&',
+    '%': r'\%',
+    '$': r'\$',
+    '#': r'\#',
+    '_': r'\_',
+    '{': r'\{',
+    '}': r'\}',
+    '~': r'\textasciitilde{}',
+    '^': r'\^{}',
+})
+
+# Speech-to-text fixes applied by _fix_common_errors, in order: (pattern, replacement)
+COMMON_ERROR_FIXES = [
+    # Email addresses: "and percent" / "at percent" / "percent" → @
+    (re.compile(r'\s+and\s+percent\s+', re.IGNORECASE), '@'),
+    (re.compile(r'\s+at\s+percent\s+', re.IGNORECASE), '@'),
+    (re.compile(r'\s+percent\s+', re.IGNORECASE), '@'),
+    # "dot com" → .com
+    (re.compile(r'\s+dot\s+com', re.IGNORECASE), '.com'),
+    (re.compile(r'\s+dot\s+org', re.IGNORECASE), '.org'),
+    # Common location mishearings
+    (re.compile(r'\bof\s+pastel\s+texas\b', re.IGNORECASE), 'El Paso, Texas'),
+    (re.compile(r'\bel\s+pastel\b', re.IGNORECASE), 'El Paso'),
+    (re.compile(r'\bpastel\s+texas\b', re.IGNORECASE), 'El Paso, Texas'),
+]
+# Every fix above needs one of these words; text without them skips the regexes
+COMMON_ERROR_TRIGGERS = ('percent', 'dot', 'pastel')
+
+# Skill extraction
+SKILL_FILLER_RE = re.compile(r'\b(I know how to|I can|I have experience with|I am able to|I have)\s+', re.IGNORECASE)
+# Skill separators: "as well as" (any case), periods, newlines, semicolons, commas and " and "
+SKILL_DELIMITER_RE = re.compile(r'(?i:\bas well as\b)|[.\n;,]| and ')
+LEADING_ARTICLE_RE = re.compile(r'^\b(the|a|an|also)\s+', re.IGNORECASE)
+SKILL_FILLER_WORDS = frozenset(['as', 'with', 'using', 'including', 'such as'])
+
+# Job title extraction
+JOB_TITLE_PATTERNS = [
+    re.compile(r'(?:I am|I\'m|I work as|My title is|I\'m a|I am a)\s+(?:a\s+)?(.+?)(?:\.|$|at|with|for)', re.IGNORECASE),
+    re.compile(r'^(.+?)(?:\s+at\s+|\s+with\s+|\s+for\s+)', re.IGNORECASE),  # Extract before "at/with/for"
+]
+TITLE_ARTICLE_RE = re.compile(r'^(a|an|the)\s+', re.IGNORECASE)
+
+# Location formatting: "City, State" and "City State"
+LOCATION_WITH_COMMA_RE = re.compile(r'([A-Z][A-Za-z\s]+),\s*([A-Z]{2}|[A-Z][a-z]+)')
+LOCATION_WITHOUT_COMMA_RE = re.compile(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+([A-Z][a-z]+)')
+
+# Contact placeholders in the template header, filled in one pass
+CONTACT_PLACEHOLDER_RE = re.compile(
+    r'\[Your (?:Full Name|Job Title/Trade|Phone Number)\]|your\.email@example\.com|\[City, State\]'
+)
+
+# Section markers. The template is used up to WORK_MARKER (preamble and
+# heading); every section from there on is generated, starting with its marker.
+WORK_MARKER = '%-----------WORK EXPERIENCE-----------'
+SKILLS_MARKER = '%-----------SKILLS-----------'
+EDUCATION_MARKER = '%-----------EDUCATION-----------'
+CERT_MARKER = '%-----------TRAINING & CERTIFICATIONS-----------'
+END_DOCUMENT = '\\end{document}'
+
+
+@functools.lru_cache(maxsize=8)
+def _read_text(filepath, mtime_ns):
+    """Read a UTF-8 file once per version; mtime_ns is part of the cache key so edits are picked up."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+@functools.lru_cache(maxsize=4)
+def _template_head(template_content):
+    """
+    The template up to its first section, without comment lines; cached per template text.
+
+    The comments are instructions for editing the template by hand, and they
+    repeat the header placeholders, so filling the head without them only
+    touches the real ones.
+    """
+    head, found, _ = template_content.partition(WORK_MARKER)
+    if not found:
+        raise ValueError(f"Template has no '{WORK_MARKER}' marker")
+    # A line that is only a comment produces nothing in TeX
+    return ''.join(line for line in head.splitlines(keepends=True) if not line.lstrip().startswith('%'))
+
+
+@functools.lru_cache(maxsize=4096)
+def _escape_latex(text):
+    """escape_latex for a str; cached because names, dates and skills repeat across resumes."""
+    # Collapse newlines and runs of whitespace into single spaces
+    text = ' '.join(text.split())
+    return text.translate(LATEX_ESCAPES)
+
+
+def _deep_escape(value):
+    """Mirror of a dict/list structure with every leaf escaped for LaTeX (non-strings via str())."""
+    if isinstance(value, dict):
+        return {key: _deep_escape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_deep_escape(item) for item in value]
+    return _escape_latex(value if isinstance(value, str) else str(value))
+
+
+@functools.lru_cache(maxsize=1)
+def _find_pdflatex():
+    """Absolute path of pdflatex, searched for once per process (None if missing)."""
+    return shutil.which('pdflatex')
+
+
+# Deletes compile scratch directories off the request path
+CLEANUP_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tex-cleanup")
+
 
 class ResumeAI:
     """Class to handle Ollama connection and file analysis."""
 
     def __init__(self, model_name="qwen2.5-coder:7b"):
-        """Initialize the Resume AI with specified Ollama model."""
+        """
+        Initialize the Resume AI with specified Ollama model.
+
+        The default qwen2.5-coder:7b tag is Ollama's Q4_K_M build; pass an
+        explicit tag (e.g. qwen2.5-coder:7b-instruct-q8_0) to trade speed for
+        precision.
+        """
         self.model_name = model_name
-        self.base_path = os.path.dirname(os.path.abspath(__file__))
+        self.base_path = BASE_PATH
+        # Enhanced accomplishments keyed by (model, original accomplishments)
+        self._enhance_cache = LRUCache(maxsize=256)
+        # Normalized resume data keyed by a hash of the raw interview JSON
+        self._normalize_cache = LRUCache(maxsize=32)
 
     def test_connection(self):
         """Test connection to Ollama instance."""
@@ -94,6 +317,7 @@ class ResumeAI:
             # Check if our target model is available
             if any(self.model_name in name for name in model_names):
                 print(f" Target model '{self.model_name}' is available")
+                self.warm_up()
                 return True
             else:
                 print(f" Warning: Model '{self.model_name}' not found in available models")
@@ -110,12 +334,24 @@ class ResumeAI:
             print("\nMake sure Ollama is running (try 'ollama serve' in terminal)")
             return False
 
+    def warm_up(self):
+        """Load the model into Ollama ahead of the first enhancement request."""
+        if not OLLAMA_AVAILABLE:
+            return False
+
+        try:
+            # An empty prompt only loads the model; nothing is generated
+            ollama.generate(model=self.model_name, prompt='', keep_alive=OLLAMA_KEEP_ALIVE)
+            return True
+        except Exception as e:
+            print(f" Warning: Could not preload '{self.model_name}': {e}")
+            return False
+
     def read_file(self, filename):
-        """Read a file from the backend-PY directory."""
+        """Read a file from the backend-PY directory (cached until the file changes)."""
         filepath = os.path.join(self.base_path, filename)
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_text(filepath, os.stat(filepath).st_mtime_ns)
             print(f" Successfully read {filename} ({len(content)} characters)")
             return content
         except FileNotFoundError:
@@ -142,13 +378,8 @@ class ResumeAI:
         if not isinstance(response, str):
             response = str(response)
 
-        # Strip whitespace AND punctuation for checking
-        response = response.strip().rstrip('.').lower()
-
-        # Check for various forms of "no" or empty responses
-        invalid_responses = ['no', 'none', 'n/a', 'na', 'nothing', '', 'nil', 'null', 'n', 'nope']
-
-        return response not in invalid_responses and len(response) > 0
+        # Strip whitespace AND punctuation, then check for various forms of "no" or empty responses
+        return response.strip().rstrip('.').lower() not in INVALID_RESPONSES
 
     def validate_and_clean_all_responses(self, interview_data):
         """
@@ -169,58 +400,25 @@ class ResumeAI:
 
         cleaned = {"interview_responses": {}}
 
-        # Clean contact information
+        # Clean contact information (answers that need no formatting are copied as-is)
         if 'contact_information' in data:
             contact = data['contact_information']
             cleaned['interview_responses']['contact_information'] = {
-                'Q1_full_name': contact.get('Q1_full_name', ''),
+                **contact,
                 'Q2_job_title': self.format_response(contact.get('Q2_job_title', ''), 'job_title'),
-                'Q3_phone_number': contact.get('Q3_phone_number', ''),
                 'Q4_email': self.format_response(contact.get('Q4_email', ''), 'default'),  # Fix email transcription errors
                 'Q5_location': self.format_response(contact.get('Q5_location', ''), 'location')
             }
 
-        # Clean work experience - Job 1
-        if 'work_experience_job1' in data:
-            job1 = data['work_experience_job1']
-            cleaned['interview_responses']['work_experience_job1'] = {
-                'Q6_company': job1.get('Q6_company', ''),
-                'Q7_location': self.format_response(job1.get('Q7_location', ''), 'location'),
-                'Q8_title': self.format_response(job1.get('Q8_title', ''), 'job_title'),
-                'Q9_start_date': job1.get('Q9_start_date', ''),
-                'Q10_end_date': job1.get('Q10_end_date', ''),
-                'Q11_accomplishment_1': job1.get('Q11_accomplishment_1', ''),
-                'Q12_accomplishment_2': job1.get('Q12_accomplishment_2', ''),
-                'Q13_accomplishment_3': job1.get('Q13_accomplishment_3', ''),
-                'Q14_accomplishment_4': job1.get('Q14_accomplishment_4', '')
-            }
-
-        # Clean work experience - Job 2
-        if 'work_experience_job2' in data:
-            job2 = data['work_experience_job2']
-            cleaned['interview_responses']['work_experience_job2'] = {
-                'Q15_company': job2.get('Q15_company', ''),
-                'Q16_location': self.format_response(job2.get('Q16_location', ''), 'location'),
-                'Q17_title': self.format_response(job2.get('Q17_title', ''), 'job_title'),
-                'Q18_start_date': job2.get('Q18_start_date', ''),
-                'Q19_end_date': job2.get('Q19_end_date', ''),
-                'Q20_accomplishment_1': job2.get('Q20_accomplishment_1', ''),
-                'Q21_accomplishment_2': job2.get('Q21_accomplishment_2', ''),
-                'Q22_accomplishment_3': job2.get('Q22_accomplishment_3', '')
-            }
-
-        # Clean work experience - Job 3
-        if 'work_experience_job3' in data:
-            job3 = data['work_experience_job3']
-            cleaned['interview_responses']['work_experience_job3'] = {
-                'Q23_company': job3.get('Q23_company', ''),
-                'Q24_location': self.format_response(job3.get('Q24_location', ''), 'location'),
-                'Q25_title': self.format_response(job3.get('Q25_title', ''), 'job_title'),
-                'Q26_start_date': job3.get('Q26_start_date', ''),
-                'Q27_end_date': job3.get('Q27_end_date', ''),
-                'Q28_accomplishment_1': job3.get('Q28_accomplishment_1', ''),
-                'Q29_accomplishment_2': job3.get('Q29_accomplishment_2', '')
-            }
+        # Clean work experience
+        for job in JOB_SECTIONS:
+            if job['section'] in data:
+                raw = data[job['section']]
+                cleaned['interview_responses'][job['section']] = {
+                    **raw,
+                    job['location']: self.format_response(raw.get(job['location'], ''), 'location'),
+                    job['title']: self.format_response(raw.get(job['title'], ''), 'job_title'),
+                }
 
         # Clean skills
         if 'skills' in data:
@@ -256,14 +454,10 @@ class ResumeAI:
         job_title = self.format_response(job_title_raw, 'job_title') if self.is_valid_response(job_title_raw) else ''
 
         # Process skills with proper filtering
-        tech_skills_str = self.format_response(data.get('skills', {}).get('Q30_technical_skills', ''), 'skills')
-        tech_skills = [s.strip() for s in tech_skills_str.split(', ') if s.strip() and s.strip().lower() != 'no']
-
-        cert_licenses_str = self.format_response(data.get('skills', {}).get('Q31_certifications_licenses', ''), 'skills')
-        cert_licenses = [s.strip() for s in cert_licenses_str.split(', ') if s.strip() and s.strip().lower() != 'no']
-
-        core_comp_str = self.format_response(data.get('skills', {}).get('Q32_core_competencies', ''), 'skills')
-        core_comp = [s.strip() for s in core_comp_str.split(', ') if s.strip() and s.strip().lower() != 'no']
+        skills = data.get('skills', {})
+        tech_skills = self._split_skills(self.format_response(skills.get('Q30_technical_skills', ''), 'skills'))
+        cert_licenses = self._split_skills(self.format_response(skills.get('Q31_certifications_licenses', ''), 'skills'))
+        core_comp = self._split_skills(self.format_response(skills.get('Q32_core_competencies', ''), 'skills'))
 
         normalized = {
             "contact_info": {
@@ -283,95 +477,31 @@ class ResumeAI:
             "certifications_detailed": []
         }
 
-        # Process job 1 if exists and is valid
-        if 'work_experience_job1' in data:
-            job1 = data['work_experience_job1']
-            company = job1.get('Q6_company', '')
-
-            # Only add job if company name is valid
-            if self.is_valid_response(company):
-                accomplishments = []
-                # Only add valid accomplishments
-                if self.is_valid_response(job1.get('Q11_accomplishment_1', '')):
-                    accomplishments.append(job1['Q11_accomplishment_1'])
-                if self.is_valid_response(job1.get('Q12_accomplishment_2', '')):
-                    accomplishments.append(job1['Q12_accomplishment_2'])
-                if self.is_valid_response(job1.get('Q13_accomplishment_3', '')):
-                    accomplishments.append(job1['Q13_accomplishment_3'])
-                if self.is_valid_response(job1.get('Q14_accomplishment_4', '')):
-                    accomplishments.append(job1['Q14_accomplishment_4'])
-
-                # Format job title
-                title_raw = job1.get('Q8_title', '')
-                title = self.format_response(title_raw, 'job_title') if self.is_valid_response(title_raw) else ''
-
-                normalized['work_experience'].append({
-                    "job_number": 1,
-                    "company": company,
-                    "location": self.format_response(job1.get('Q7_location', ''), 'location'),
-                    "title": title,
-                    "start_date": job1.get('Q9_start_date', ''),
-                    "end_date": job1.get('Q10_end_date', ''),
-                    "accomplishments": accomplishments
-                })
+        # Process jobs that exist and have a valid company name
+        for job_number, job in enumerate(JOB_SECTIONS, 1):
+            if job['section'] not in data:
+                continue
+            raw = data[job['section']]
+            company = raw.get(job['company'], '')
+            if not self.is_valid_response(company):
+                continue
 
-        # Process job 2 if exists and is valid
-        if 'work_experience_job2' in data:
-            job2 = data['work_experience_job2']
-            company = job2.get('Q15_company', '')
-
-            # Only add job if company name is valid
-            if self.is_valid_response(company):
-                accomplishments = []
-                # Only add valid accomplishments
-                if self.is_valid_response(job2.get('Q20_accomplishment_1', '')):
-                    accomplishments.append(job2['Q20_accomplishment_1'])
-                if self.is_valid_response(job2.get('Q21_accomplishment_2', '')):
-                    accomplishments.append(job2['Q21_accomplishment_2'])
-                if self.is_valid_response(job2.get('Q22_accomplishment_3', '')):
-                    accomplishments.append(job2['Q22_accomplishment_3'])
-
-                # Format job title
-                title_raw = job2.get('Q17_title', '')
-                title = self.format_response(title_raw, 'job_title') if self.is_valid_response(title_raw) else ''
-
-                normalized['work_experience'].append({
-                    "job_number": 2,
-                    "company": company,
-                    "location": self.format_response(job2.get('Q16_location', ''), 'location'),
-                    "title": title,
-                    "start_date": job2.get('Q18_start_date', ''),
-                    "end_date": job2.get('Q19_end_date', ''),
-                    "accomplishments": accomplishments
-                })
+            # Only add valid accomplishments
+            accomplishments = [raw[key] for key in job['accomplishments'] if self.is_valid_response(raw.get(key, ''))]
 
-        # Process job 3 if exists and is valid
-        if 'work_experience_job3' in data:
-            job3 = data['work_experience_job3']
-            company = job3.get('Q23_company', '')
-
-            # Only add job if company name is valid
-            if self.is_valid_response(company):
-                accomplishments = []
-                # Only add valid accomplishments
-                if self.is_valid_response(job3.get('Q28_accomplishment_1', '')):
-                    accomplishments.append(job3['Q28_accomplishment_1'])
-                if self.is_valid_response(job3.get('Q29_accomplishment_2', '')):
-                    accomplishments.append(job3['Q29_accomplishment_2'])
-
-                # Format job title
-                title_raw = job3.get('Q25_title', '')
-                title = self.format_response(title_raw, 'job_title') if self.is_valid_response(title_raw) else ''
-
-                normalized['work_experience'].append({
-                    "job_number": 3,
-                    "company": company,
-                    "location": self.format_response(job3.get('Q24_location', ''), 'location'),
-                    "title": title,
-                    "start_date": job3.get('Q26_start_date', ''),
-                    "end_date": job3.get('Q27_end_date', ''),
-                    "accomplishments": accomplishments
-                })
+            # Format job title
+            title_raw = raw.get(job['title'], '')
+            title = self.format_response(title_raw, 'job_title') if self.is_valid_response(title_raw) else ''
+
+            normalized['work_experience'].append({
+                "job_number": job_number,
+                "company": company,
+                "location": self.format_response(raw.get(job['location'], ''), 'location'),
+                "title": title,
+                "start_date": raw.get(job['start_date'], ''),
+                "end_date": raw.get(job['end_date'], ''),
+                "accomplishments": accomplishments
+            })
 
         # Process education
         if 'education' in data:
@@ -394,78 +524,34 @@ class ResumeAI:
         if 'certifications_detailed' in data:
             certs = data['certifications_detailed']
 
-            # Cert 1
-            if 'certification_1' in certs and certs['certification_1'].get('Q39_name'):
-                cert1 = certs['certification_1']
-                normalized['certifications_detailed'].append({
-                    "name": cert1.get('Q39_name', ''),
-                    "organization": cert1.get('Q40_organization', ''),
-                    "date": cert1.get('Q41_date', ''),
-                    "details": cert1.get('Q42_details', 'No')
-                })
-
-            # Cert 2
-            if 'certification_2' in certs and certs['certification_2'].get('Q43_name') and certs['certification_2'].get('Q43_name').lower() != 'no':
-                cert2 = certs['certification_2']
-                normalized['certifications_detailed'].append({
-                    "name": cert2.get('Q43_name', ''),
-                    "organization": cert2.get('Q44_organization', ''),
-                    "date": cert2.get('Q45_date', ''),
-                    "details": cert2.get('Q46_details', 'No')
-                })
-
-            # Cert 3
-            if 'certification_3' in certs and certs['certification_3'].get('Q47_name') and certs['certification_3'].get('Q47_name').lower() != 'no':
-                cert3 = certs['certification_3']
-                normalized['certifications_detailed'].append({
-                    "name": cert3.get('Q47_name', ''),
-                    "organization": cert3.get('Q48_organization', ''),
-                    "date": cert3.get('Q49_date', ''),
-                    "details": cert3.get('Q50_details', 'No')
-                })
-
-            # Cert 4
-            if 'certification_4' in certs and certs['certification_4'].get('Q51_name') and certs['certification_4'].get('Q51_name').lower() != 'no':
-                cert4 = certs['certification_4']
+            for section, name_key, org_key, date_key, details_key in CERT_SECTIONS:
+                cert = certs.get(section)
+                # Skip missing certifications and ones answered "no"
+                if not cert or not cert.get(name_key) or cert[name_key].lower() == 'no':
+                    continue
                 normalized['certifications_detailed'].append({
-                    "name": cert4.get('Q51_name', ''),
-                    "organization": cert4.get('Q52_organization', ''),
-                    "date": cert4.get('Q53_date', ''),
-                    "details": cert4.get('Q54_details', 'No')
+                    "name": cert.get(name_key, ''),
+                    "organization": cert.get(org_key, ''),
+                    "date": cert.get(date_key, ''),
+                    "details": cert.get(details_key, 'No')
                 })
 
         return normalized
 
+    def _split_skills(self, skills_text):
+        """Split a formatted skills string into a list, dropping blanks and "No"."""
+        skills = []
+        for skill in skills_text.split(', '):
+            skill = skill.strip()
+            if skill and skill.lower() != 'no':
+                skills.append(skill)
+        return skills
+
     def escape_latex(self, text):
         """Escape special LaTeX characters in text."""
         if not isinstance(text, str):
             text = str(text)
-
-        # Remove or replace problematic whitespace
-        text = text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
-        # Collapse multiple spaces
-        text = ' '.join(text.split())
-
-        # IMPORTANT: Replace backslash FIRST to avoid corrupting other escape sequences
-        text = text.replace('\\', r'\textbackslash{}')
-
-        # Then replace other special characters
-        replacements = [
-            ('&', r'\&'),
-            ('%', r'\%'),
-            ('$', r'\$'),
-            ('#', r'\#'),
-            ('_', r'\_'),
-            ('{', r'\{'),
-            ('}', r'\}'),
-            ('~', r'\textasciitilde{}'),
-            ('^', r'\^{}'),
-        ]
-
-        for char, replacement in replacements:
-            text = text.replace(char, replacement)
-
-        return text
+        return _escape_latex(text)
 
     def format_response(self, response_text, question_type):
         """
@@ -483,13 +569,15 @@ class ResumeAI:
             response_text = str(response_text)
 
         response_text = response_text.strip()
+        lowered = response_text.lower()
 
         # Handle empty or "no" responses
-        if not response_text or response_text.strip().rstrip('.').lower() in ['no', 'none', 'n/a', 'na']:
+        if not response_text or lowered.rstrip('.') in ('no', 'none', 'n/a', 'na'):
             return 'No'
 
         # Fix common transcription errors FIRST (before other processing)
-        response_text = self._fix_common_errors(response_text)
+        if any(trigger in lowered for trigger in COMMON_ERROR_TRIGGERS):
+            response_text = self._fix_common_errors(response_text)
 
         # Skills extraction - ensure comma-separated list only
         if question_type == 'skills':
@@ -515,47 +603,26 @@ class ResumeAI:
 
     def _fix_common_errors(self, text):
         """Fix common transcription and speech-to-text errors"""
-        import re
-
-        # Fix email addresses
-        # "and percent" or "at percent" → @
-        text = re.sub(r'\s+and\s+percent\s+', '@', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s+at\s+percent\s+', '@', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s+percent\s+', '@', text, flags=re.IGNORECASE)
-
-        # "dot com" → .com
-        text = re.sub(r'\s+dot\s+com', '.com', text, flags=re.IGNORECASE)
-        text = re.sub(r'\s+dot\s+org', '.org', text, flags=re.IGNORECASE)
-
-        # Common location mishearings
-        text = re.sub(r'\bof\s+pastel\s+texas\b', 'El Paso, Texas', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bel\s+pastel\b', 'El Paso', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bpastel\s+texas\b', 'El Paso, Texas', text, flags=re.IGNORECASE)
-
+        for pattern, replacement in COMMON_ERROR_FIXES:
+            text = pattern.sub(replacement, text)
         return text
 
     def _extract_skills_from_text(self, text):
         """Extract individual skills from text, handling sentences"""
-        import re
-
         skills = []
 
         # Remove common filler phrases
-        text = re.sub(r'\b(I know how to|I can|I have experience with|I am able to|I have)\s+', '', text, flags=re.IGNORECASE)
-        text = re.sub(r'\bas well as\b', ',', text, flags=re.IGNORECASE)
-
-        # Split by periods, newlines, "and", and commas
-        text = text.replace('.', ',').replace('\n', ',').replace(';', ',').replace(' and ', ', ')
+        text = SKILL_FILLER_RE.sub('', text)
 
-        # Extract skills from parts
-        for part in text.split(','):
+        # Split by "as well as", periods, newlines, semicolons, commas and "and" in one pass
+        for part in SKILL_DELIMITER_RE.split(text):
             part = part.strip()
 
             if not part:
                 continue
 
             # Remove leading articles and common words
-            part = re.sub(r'^\b(the|a|an|also)\s+', '', part, flags=re.IGNORECASE)
+            part = LEADING_ARTICLE_RE.sub('', part)
             part = part.strip()
 
             # Skip if too long (likely still a sentence) or empty
@@ -563,7 +630,7 @@ class ResumeAI:
                 continue
 
             # Skip common filler phrases
-            if part.lower() in ['as', 'with', 'using', 'including', 'such as']:
+            if part.lower() in SKILL_FILLER_WORDS:
                 continue
 
             skills.append(part)
@@ -572,22 +639,15 @@ class ResumeAI:
 
     def _extract_job_title(self, text):
         """Extract job title from text"""
-        import re
-
         # Remove common filler words and sentences
         # Look for patterns like "I am a X" or "I work as a X"
         if len(text.split()) > 5:
-            patterns = [
-                r'(?:I am|I\'m|I work as|My title is|I\'m a|I am a)\s+(?:a\s+)?(.+?)(?:\.|$|at|with|for)',
-                r'^(.+?)(?:\s+at\s+|\s+with\s+|\s+for\s+)',  # Extract before "at/with/for"
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
+            for pattern in JOB_TITLE_PATTERNS:
+                match = pattern.search(text)
                 if match:
                     title = match.group(1).strip()
                     # Clean up common articles
-                    title = re.sub(r'^(a|an|the)\s+', '', title, flags=re.IGNORECASE)
+                    title = TITLE_ARTICLE_RE.sub('', title)
                     if title and len(title.split()) <= 4:  # Reasonable title length
                         return title
 
@@ -601,10 +661,8 @@ class ResumeAI:
 
     def _format_location(self, text):
         """Format location as 'City, State'"""
-        import re
-
         # Already properly formatted?
-        match = re.search(r'([A-Z][A-Za-z\s]+),\s*([A-Z]{2}|[A-Z][a-z]+)', text)
+        match = LOCATION_WITH_COMMA_RE.search(text)
         if match:
             city = match.group(1).strip()
             state = match.group(2).strip()
@@ -616,7 +674,7 @@ class ResumeAI:
 
         # Try to extract something usable
         # Look for "City State" pattern without comma
-        match = re.search(r'([A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s+([A-Z][a-z]+)', text)
+        match = LOCATION_WITHOUT_COMMA_RE.search(text)
         if match:
             city = match.group(1).strip()
             state = match.group(2).strip()
@@ -625,162 +683,332 @@ class ResumeAI:
         # If nothing works, return cleaned text
         return text.strip().rstrip('.')
 
+    def _enhance_prompt(self, accomplishments):
+        """Prompt asking the model to enhance one job's accomplishments."""
+        return f"""Enhance these job accomplishments to be more professional and impactful. Keep them truthful.
+
+Original accomplishments:
+{chr(10).join(f'- {acc}' for acc in accomplishments)}
+
+Instructions:
+- Make each point more professional and detailed
+- Emphasize technical skills, tools, and quantifiable results
+- Use strong action verbs
+- Keep content truthful to the original
+- Return ONLY the enhanced bullet points, one per line, starting with the text (no dashes or bullets)
+- Each bullet point must be on a SINGLE line (no line breaks within a point)
+
+Enhanced accomplishments:"""
+
     def enhance_accomplishments_with_ai(self, accomplishments):
         """Use AI to enhance accomplishment descriptions."""
         if not OLLAMA_AVAILABLE:
             print("  Warning: Ollama not available, using original text")
             return accomplishments
 
+        try:
+            stream = ollama.chat(
+                model=self.model_name,
+                messages=[{'role': 'user', 'content': self._enhance_prompt(accomplishments)}],
+                stream=True,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                options=self._enhance_options(len(accomplishments) * ENHANCE_TOKENS_PER_ITEM)
+            )
+            lines = self._parse_enhanced_lines(self._read_until_lines(stream, len(accomplishments)))
+            return lines if lines else accomplishments
+        except Exception as e:
+            print(f"  Warning: AI enhancement failed ({e}), using original text")
+            return accomplishments
+
+    def _read_until_lines(self, stream, count):
+        """
+        Collect a streamed reply until it holds `count` complete bullet lines.
+
+        The model often adds notes after the list; closing the stream as soon
+        as the bullets are in stops Ollama from generating them.
+        """
+        parts = []
+        try:
+            for chunk in stream:
+                content = chunk['message']['content']
+                parts.append(content)
+                if '\n' in content:
+                    text = ''.join(parts)
+                    # Drop the partial line after the last newline
+                    complete = text[:text.rfind('\n')]
+                    if len(self._parse_enhanced_lines(complete)) >= count:
+                        return complete
+        finally:
+            stream.close()
+        return ''.join(parts)
+
+    def _read_until_jobs(self, stream, count):
+        """Collect a streamed batch reply until all `count` [/JOB_n] markers are in, then close it."""
+        closers = [f"[/JOB_{n}]" for n in range(1, count + 1)]
+        parts = []
+        try:
+            for chunk in stream:
+                content = chunk['message']['content']
+                parts.append(content)
+                if ']' in content:
+                    text = ''.join(parts)
+                    if all(closer in text for closer in closers):
+                        return text
+        finally:
+            stream.close()
+        return ''.join(parts)
+
+    async def _enhance_async(self, client, accomplishments):
+        """enhance_accomplishments_with_ai for an ollama.AsyncClient."""
+        try:
+            response = await client.chat(
+                model=self.model_name,
+                messages=[{'role': 'user', 'content': self._enhance_prompt(accomplishments)}],
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                options=self._enhance_options(len(accomplishments) * ENHANCE_TOKENS_PER_ITEM)
+            )
+            lines = self._parse_enhanced_lines(response['message']['content'])
+            return lines if lines else accomplishments
+        except Exception as e:
+            print(f"  Warning: AI enhancement failed ({e}), using original text")
+            return accomplishments
+
+    def _enhance_many(self, jobs_accomplishments):
+        """
+        Enhance several jobs with one request each, all in flight at once.
+
+        Ollama decodes up to OLLAMA_NUM_PARALLEL requests together, so this
+        takes about as long as the slowest job. Must not be called from a
+        thread that is already running an event loop.
+        """
+        async def enhance_all():
+            client = ollama.AsyncClient()
+            return await asyncio.gather(*(self._enhance_async(client, accs) for accs in jobs_accomplishments))
+
+        return asyncio.run(enhance_all())
+
+    def _enhance_options(self, num_predict):
+        """Ollama options for enhancement calls; num_predict caps the reply length."""
+        return {'num_ctx': ENHANCE_NUM_CTX, 'num_predict': min(num_predict, ENHANCE_NUM_CTX)}
+
+    def _parse_enhanced_lines(self, text):
+        """Split enhanced text into bullet lines, dropping bullet markers and headers."""
+        lines = []
+        for line in text.strip().split('\n'):
+            line = line.strip().lstrip('-•* ')
+            # Skip empty lines and common headers
+            if line and not line.lower().startswith(('enhanced', 'accomplishment', ':')):
+                lines.append(line)
+        return lines
+
+    def enhance_all_jobs(self, jobs_accomplishments):
+        """
+        Enhance the accomplishments of every job with a single AI call
+        (or concurrent per-job calls, see ENHANCE_BATCH).
+
+        Results are cached per job, so regenerating a resume only sends the
+        jobs whose accomplishments changed.
+
+        Args:
+            jobs_accomplishments: List of accomplishment lists, one per job
+
+        Returns:
+            List of enhanced accomplishment lists, in the same order
+        """
+        results = list(jobs_accomplishments)
+        pending = []
+        for i, accomplishments in enumerate(jobs_accomplishments):
+            if not accomplishments:
+                continue
+            cached = self._enhance_cache.get((self.model_name, tuple(accomplishments)))
+            if cached is not None:
+                results[i] = list(cached)
+            else:
+                pending.append(i)
+
+        if not pending:
+            return results
+
+        if not OLLAMA_AVAILABLE:
+            print("  Warning: Ollama not available, using original text")
+            return results
+
+        if len(pending) == 1:
+            i = pending[0]
+            enhanced = {i: self.enhance_accomplishments_with_ai(jobs_accomplishments[i])}
+        else:
+            enhance = self._enhance_batch if ENHANCE_BATCH else self._enhance_many
+            enhanced = enhance([jobs_accomplishments[i] for i in pending])
+            enhanced = {i: enhanced[n] for n, i in enumerate(pending)}
+
+        for i, lines in enhanced.items():
+            original = jobs_accomplishments[i]
+            # The enhancers hand back the original list when they fail; don't cache that
+            if lines is not original:
+                self._enhance_cache[(self.model_name, tuple(original))] = tuple(lines)
+            results[i] = lines
+        return results
+
+    def _enhance_batch(self, jobs_accomplishments):
+        """One AI call for several jobs; falls back to original text for any job it misses."""
+        job_blocks = "\n".join(
+            f"[JOB_{n}]\n" + "\n".join(f"- {acc}" for acc in accomplishments) + f"\n[/JOB_{n}]"
+            for n, accomplishments in enumerate(jobs_accomplishments, 1)
+        )
         prompt = f"""Enhance these job accomplishments to be more professional and impactful. Keep them truthful.
 
-Original accomplishments:
-{chr(10).join(f'- {acc}' for acc in accomplishments)}
+Original accomplishments, grouped by job:
+{job_blocks}
 
 Instructions:
 - Make each point more professional and detailed
 - Emphasize technical skills, tools, and quantifiable results
 - Use strong action verbs
 - Keep content truthful to the original
-- Return ONLY the enhanced bullet points, one per line, starting with the text (no dashes or bullets)
+- Keep every job's points inside its own [JOB_n] and [/JOB_n] markers, exactly as given
+- Inside each job block, return ONLY the enhanced bullet points, one per line, starting with the text (no dashes or bullets)
 - Each bullet point must be on a SINGLE line (no line breaks within a point)
 
 Enhanced accomplishments:"""
 
         try:
-            response = ollama.chat(
+            stream = ollama.chat(
                 model=self.model_name,
-                messages=[{'role': 'user', 'content': prompt}]
+                messages=[{'role': 'user', 'content': prompt}],
+                stream=True,
+                keep_alive=OLLAMA_KEEP_ALIVE,
+                options=self._enhance_options(
+                    sum(map(len, jobs_accomplishments)) * ENHANCE_TOKENS_PER_ITEM
+                    + len(jobs_accomplishments) * ENHANCE_TOKENS_PER_JOB
+                )
             )
-            enhanced = response['message']['content'].strip()
-            # Split into lines and clean thoroughly
-            lines = []
-            for line in enhanced.split('\n'):
-                line = line.strip().lstrip('-•* ')
-                # Skip empty lines and common headers
-                if line and not line.lower().startswith(('enhanced', 'accomplishment', ':')):
-                    lines.append(line)
-            return lines if lines else accomplishments
+            text = self._read_until_jobs(stream, len(jobs_accomplishments))
         except Exception as e:
             print(f"  Warning: AI enhancement failed ({e}), using original text")
-            return accomplishments
+            return list(jobs_accomplishments)
+
+        blocks = {int(n): body for n, body in JOB_BLOCK_RE.findall(text)}
+        results = [self._parse_enhanced_lines(blocks.get(n, '')) for n in range(1, len(jobs_accomplishments) + 1)]
+
+        # Jobs the model dropped from its reply are retried with their own prompts, concurrently
+        missing = [i for i, lines in enumerate(results) if not lines]
+        if missing:
+            retried = self._enhance_many([jobs_accomplishments[i] for i in missing])
+            for i, lines in zip(missing, retried):
+                results[i] = lines
+        return results
 
     def fill_template_programmatically(self, resume_data, template_content, enhance=True):
-        """Fill the template using Python string replacement."""
-        import re
-        filled = template_content
+        """Fill the template's heading and build every section after it, joined once."""
+        # Escape every field once up front; resume_data keeps the raw values for checks
+        esc_data = _deep_escape(resume_data)
+        head = _template_head(template_content)
 
         # 1. Contact Information
-        filled = filled.replace('[Your Full Name]', self.escape_latex(resume_data['contact_info']['full_name']))
-        filled = filled.replace('[Your Job Title/Trade]', self.escape_latex(resume_data['contact_info']['job_title']))
-        filled = filled.replace('[Your Phone Number]', self.escape_latex(resume_data['contact_info']['phone_number']))
+        contact = resume_data['contact_info']
+        esc_contact = esc_data['contact_info']
+        subs = {
+            '[Your Full Name]': esc_contact['full_name'],
+            '[Your Job Title/Trade]': esc_contact['job_title'],
+            '[Your Phone Number]': esc_contact['phone_number'],
+            '[City, State]': esc_contact['location'],
+        }
 
         # Handle email (remove if not provided)
-        if resume_data['contact_info']['email'].lower() == 'no':
-            filled = re.sub(r'\\href\{mailto:your\.email@example\.com\}\{your\.email@example\.com\}\s*\$\|\$\s*\n?', '', filled)
+        if contact['email'].lower() == 'no':
+            head = re.sub(r'\\href\{mailto:your\.email@example\.com\}\{your\.email@example\.com\}\s*\$\|\$\s*\n?', '', head)
         else:
-            filled = filled.replace('your.email@example.com', self.escape_latex(resume_data['contact_info']['email']))
+            subs['your.email@example.com'] = esc_contact['email']
 
-        filled = filled.replace('[City, State]', self.escape_latex(resume_data['contact_info']['location']), 1)
+        def contact_value(match):
+            return subs.get(match.group(0), match.group(0))
 
-        # 2. Work Experience
+        # Collect the document's pieces and join once at the end
+        parts = [CONTACT_PLACEHOLDER_RE.sub(contact_value, head)]
+
+        # 2. Work Experience (left out if there are no jobs)
         if resume_data['work_experience']:
-            new_work_exp = "%-----------WORK EXPERIENCE-----------\n"
-            new_work_exp += "\\section{Work Experience}\n\\resumeSubHeadingListStart\n\n"
-
-            for job in resume_data['work_experience']:
-                accomplishments = job['accomplishments']
-                if enhance:
-                    print(f"  Enhancing accomplishments for {job['company']}...")
-                    accomplishments = self.enhance_accomplishments_with_ai(accomplishments)
-
-                new_work_exp += f"  \\resumeSubheading\n"
-                new_work_exp += f"    {{{self.escape_latex(job['company'])}}}{{{self.escape_latex(job['start_date'])} - {self.escape_latex(job['end_date'])}}}\n"
-                new_work_exp += f"    {{{self.escape_latex(job['title'])}}}{{{self.escape_latex(job['location'])}}}\n"
-                new_work_exp += f"    \\resumeItemListStart\n"
-
-                for acc in accomplishments:
-                    if not acc or not acc.strip():
-                        continue
-                    escaped_acc = self.escape_latex(acc)
-                    new_work_exp += f"      \\resumeItem{{{escaped_acc}}}\n"
-
-                new_work_exp += f"    \\resumeItemListEnd\n\n"
-
-            new_work_exp += "\\resumeSubHeadingListEnd\n\\vspace{-15pt}\n\n%-----------SKILLS-----------"
-
-            filled = re.sub(
-                r'%-----------WORK EXPERIENCE-----------(.*?)%-----------SKILLS-----------',
-                lambda _: new_work_exp,
-                filled,
-                flags=re.DOTALL
-            )
+            jobs = resume_data['work_experience']
+            if enhance:
+                # One AI call for all jobs instead of one per job
+                print(f"  Enhancing accomplishments for {len(jobs)} job(s)...")
+                jobs_accomplishments = _deep_escape(
+                    self.enhance_all_jobs([job['accomplishments'] for job in jobs])
+                )
+            else:
+                jobs_accomplishments = [job['accomplishments'] for job in esc_data['work_experience']]
+
+            parts.append(WORK_MARKER + "\n")
+            parts.append("\\section{Work Experience}\n\\resumeSubHeadingListStart\n\n")
+
+            for job, accomplishments in zip(esc_data['work_experience'], jobs_accomplishments):
+                parts.append("  \\resumeSubheading\n")
+                parts.append(f"    {{{job['company']}}}{{{job['start_date']} - {job['end_date']}}}\n")
+                parts.append(f"    {{{job['title']}}}{{{job['location']}}}\n")
+                parts.append("    \\resumeItemListStart\n")
+
+                # Escaping collapses whitespace, so blank accomplishments are empty here
+                parts.extend(
+                    f"      \\resumeItem{{{acc}}}\n"
+                    for acc in accomplishments
+                    if acc
+                )
 
-        # 3. Skills - rebuild the entire section with correct structure
-        skills_list = ', '.join([self.escape_latex(s) for s in resume_data['skills']['technical_skills']])
-        certs_list = ', '.join([self.escape_latex(c) for c in resume_data['skills']['certifications_licenses']])
-        comp_list = ', '.join([self.escape_latex(c) for c in resume_data['skills']['core_competencies']])
-
-        # Build the skills section with correct LaTeX structure
-        new_skills_section = "%-----------SKILLS-----------\n"
-        new_skills_section += "\\section{Skills}\n"
-        new_skills_section += "\\resumeItemListStart\n"
-        new_skills_section += f"  \\resumeItem{{\\textbf{{Technical Skills:}} {skills_list}}}\n"
-        new_skills_section += f"  \\resumeItem{{\\textbf{{Certifications \\& Licenses:}} {certs_list}}}\n"
-        new_skills_section += f"  \\resumeItem{{\\textbf{{Core Competencies:}} {comp_list}}}\n"
-        new_skills_section += "\\resumeItemListEnd\n"
-        new_skills_section += "\\vspace{-15pt}\n\n"
-        new_skills_section += "%-----------EDUCATION-----------"
-
-        # Replace the entire skills section
-        filled = re.sub(
-            r'%-----------SKILLS-----------(.*?)%-----------EDUCATION-----------',
-            lambda _: new_skills_section,
-            filled,
-            flags=re.DOTALL
-        )
+                parts.append("    \\resumeItemListEnd\n\n")
 
-        # 4. Education (remove section if no education data)
-        if resume_data['education']:
-            edu = resume_data['education'][0]
-            filled = re.sub(r'\[School/Institution Name\]', lambda _: self.escape_latex(edu['institution']), filled, count=1)
-            filled = re.sub(r'\[Graduation Date or "Present"\]', lambda _: self.escape_latex(edu['date']), filled, count=1)
-            filled = re.sub(r'\[Degree/Diploma/Certificate\]', lambda _: self.escape_latex(edu['credential']), filled, count=1)
-            filled = filled.replace('[City, State]', self.escape_latex(edu['location']))
-        else:
-            # Remove entire education section if no education data
-            filled = re.sub(
-                r'%-----------EDUCATION-----------(.*?)%-----------TRAINING & CERTIFICATIONS-----------',
-                '%-----------TRAINING & CERTIFICATIONS-----------',
-                filled,
-                flags=re.DOTALL
-            )
+            parts.append("\\resumeSubHeadingListEnd\n\\vspace{-15pt}\n\n")
 
-        # 5. Certifications
-        if resume_data['certifications_detailed']:
-            new_cert_section = "%-----------TRAINING & CERTIFICATIONS-----------\n"
-            new_cert_section += "\\section{Training \\& Certifications}\n\\resumeSubHeadingListStart\n"
+        # 3. Skills
+        skills_list = ', '.join(esc_data['skills']['technical_skills'])
+        certs_list = ', '.join(esc_data['skills']['certifications_licenses'])
+        comp_list = ', '.join(esc_data['skills']['core_competencies'])
 
-            for cert in resume_data['certifications_detailed']:
-                details = f" - {self.escape_latex(cert['details'])}" if cert['details'] and cert['details'].lower() != 'no' else ''
-                new_cert_section += f"    \\resumeItem{{\\textbf{{{self.escape_latex(cert['name'])}}} - {self.escape_latex(cert['organization'])}, {self.escape_latex(cert['date'])}{details}}}\n"
+        parts.extend([
+            SKILLS_MARKER + "\n",
+            "\\section{Skills}\n",
+            "\\resumeItemListStart\n",
+            f"  \\resumeItem{{\\textbf{{Technical Skills:}} {skills_list}}}\n",
+            f"  \\resumeItem{{\\textbf{{Certifications \\& Licenses:}} {certs_list}}}\n",
+            f"  \\resumeItem{{\\textbf{{Core Competencies:}} {comp_list}}}\n",
+            "\\resumeItemListEnd\n",
+            "\\vspace{-15pt}\n\n",
+        ])
 
-            new_cert_section += "\\resumeSubHeadingListEnd\n\\vspace{-16pt}\n\n\\end{document}"
+        # 4. Education (left out if there is no education data)
+        if resume_data['education']:
+            edu = esc_data['education'][0]
+            parts.extend([
+                EDUCATION_MARKER + "\n",
+                "\\section{Education}\n\\resumeSubHeadingListStart\n",
+                "  \\resumeSubheading\n",
+                f"    {{{edu['institution']}}}{{{edu['date']}}}\n",
+                f"    {{{edu['credential']}}}{{{edu['location']}}}\n",
+                "\\resumeSubHeadingListEnd\n\\vspace{-15pt}\n\n",
+            ])
+
+        # 5. Certifications (left out if there are none)
+        if resume_data['certifications_detailed']:
+            parts.append(CERT_MARKER + "\n")
+            parts.append("\\section{Training \\& Certifications}\n\\resumeSubHeadingListStart\n")
 
-            filled = re.sub(
-                r'%-----------TRAINING & CERTIFICATIONS-----------(.*?)\\end\{document\}',
-                lambda _: new_cert_section,
-                filled,
-                flags=re.DOTALL
-            )
+            for cert, esc_cert in zip(resume_data['certifications_detailed'], esc_data['certifications_detailed']):
+                details = f" - {esc_cert['details']}" if cert['details'] and cert['details'].lower() != 'no' else ''
+                parts.append(f"    \\resumeItem{{\\textbf{{{esc_cert['name']}}} - {esc_cert['organization']}, {esc_cert['date']}{details}}}\n")
+
+            parts.append("\\resumeSubHeadingListEnd\n\\vspace{-16pt}\n\n")
 
-        return filled
+        parts.append(END_DOCUMENT + "\n")
+        return ''.join(parts)
 
-    def compile_latex_to_pdf(self, tex_file_path):
+    def compile_latex_to_pdf(self, tex_file_path, tex_source=None):
         """
         Compile a LaTeX file to PDF using pdflatex.
 
         Args:
             tex_file_path (str): Path to the .tex file
+            tex_source (str): The document's LaTeX. When given it is streamed to
+                pdflatex on stdin and tex_file_path only names the output (the
+                file doesn't have to exist). Needs STREAM_TEX_SOURCE.
 
         Returns:
             str: Path to the generated PDF file, or None if compilation failed
@@ -795,57 +1023,79 @@ Enhanced accomplishments:"""
             print(f"\nCompiling LaTeX to PDF...")
 
             # Check if pdflatex is available
-            if not shutil.which('pdflatex'):
+            pdflatex = _find_pdflatex()
+            if not pdflatex:
                 print("  Warning: pdflatex not found. Please install a LaTeX distribution:")
                 print("    - Windows: MiKTeX or TeX Live")
                 print("    - macOS: MacTeX")
                 print("    - Linux: texlive-full")
                 return None
 
-            # Run pdflatex twice (for proper formatting and references)
-            for run_num in range(2):
-                if run_num == 0:
-                    print(f"  First pass...")
-                else:
-                    print(f"  Second pass...")
-
-                result = subprocess.run(
-                    ['pdflatex', '-interaction=nonstopmode', '-halt-on-error', '-output-directory', tex_dir, tex_file_path],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    cwd=tex_dir,
-                    timeout=60  # Increased to 60 seconds
-                )
-
-                if result.returncode != 0:
-                    print(f"  Error: pdflatex compilation failed")
-                    print(f"  Return code: {result.returncode}")
-                    # Print last few lines of output for debugging
-                    output = result.stdout.decode('utf-8', errors='ignore')
-                    lines = output.split('\n')
-                    print("  Last 10 lines of output:")
-                    for line in lines[-10:]:
-                        if line.strip():
-                            print(f"    {line}")
-                    return None
-
-            # Clean up auxiliary files
-            aux_extensions = ['.aux', '.log', '.out']
             base_name = tex_filename.replace('.tex', '')
-            for ext in aux_extensions:
-                aux_file = os.path.join(tex_dir, base_name + ext)
-                if os.path.exists(aux_file):
-                    try:
-                        os.remove(aux_file)
-                    except:
-                        pass  # Ignore cleanup errors
+            work_dir = tempfile.mkdtemp(prefix='resumeai-', dir=COMPILE_TMP_ROOT)
 
-            if os.path.exists(pdf_path):
-                print(f"  ✓ PDF compiled successfully: {pdf_filename}")
-                return pdf_path
-            else:
-                print(f"  Error: PDF file was not created")
-                return None
+            try:
+                def read_log():
+                    try:
+                        with open(os.path.join(work_dir, base_name + '.log'), 'rb') as f:
+                            return f.read()
+                    except OSError:
+                        return b''
+
+                # The document is either read from the .tex file or, when
+                # tex_source is given, streamed to pdflatex on stdin
+                feed = tex_source.encode('utf-8') if tex_source is not None else b''
+                source = [tex_file_path] if tex_source is None else [f'-jobname={base_name}', '\\input{/dev/stdin}']
+
+                def run_pass(label, mode):
+                    print(f"  {label}...")
+                    with PDFLATEX_SLOTS:
+                        # pdflatex's terminal output is discarded (batchmode, DEVNULL);
+                        # the .log file has everything it would print, and a piped
+                        # stdout that nobody drains can stall the process
+                        returncode = tex_worker.run_pdflatex(
+                            [pdflatex, *mode, '-interaction=batchmode', '-halt-on-error', '-output-directory', work_dir, *source],
+                            input=feed,
+                            cwd=tex_dir,
+                            timeout=60  # Increased to 60 seconds
+                        )
+
+                    if returncode != 0:
+                        print(f"  Error: pdflatex compilation failed")
+                        print(f"  Return code: {returncode}")
+                        # Print last few lines of the log for debugging
+                        lines = read_log().decode('utf-8', errors='ignore').split('\n')
+                        print("  Last 10 lines of the log:")
+                        for line in lines[-10:]:
+                            if line.strip():
+                                print(f"    {line}")
+                        return False
+                    return True
+
+                # The template has no cross-references, so one pass normally
+                # produces the final PDF and a second runs only when LaTeX reports
+                # changed labels. RESUMEAI_DOUBLE_PASS=1 always runs a -draftmode
+                # pass (.aux only, no PDF) before the final one.
+                if PDFLATEX_DOUBLE_PASS:
+                    if not (run_pass("First pass", ['-draftmode']) and run_pass("Second pass", [])):
+                        return None
+                elif not run_pass("Compiling", []):
+                    return None
+                elif LATEX_RERUN_RE.search(read_log()):
+                    if not run_pass("Second pass (cross-references changed)", []):
+                        return None
+
+                work_pdf = os.path.join(work_dir, pdf_filename)
+                if os.path.exists(work_pdf):
+                    shutil.move(work_pdf, pdf_path)
+                    print(f"  ✓ PDF compiled successfully: {pdf_filename}")
+                    return pdf_path
+                else:
+                    print(f"  Error: PDF file was not created")
+                    return None
+            finally:
+                # Remove the scratch directory (.aux, .log, .out) after returning
+                CLEANUP_POOL.submit(shutil.rmtree, work_dir, ignore_errors=True)
 
         except subprocess.TimeoutExpired:
             print("  Error: LaTeX compilation timed out after 60 seconds")
@@ -858,7 +1108,51 @@ Enhanced accomplishments:"""
             traceback.print_exc()
             return None
 
-    def generate_resume(self, json_data, output_filename="resume", enhance=True, compile_pdf=True, keep_tex=False):
+    def prepare_resume_data(self, json_data):
+        """
+        Validate, clean and normalize interview data for the template.
+
+        Results are cached by the content of json_data, so regenerating the
+        same answers (e.g. after a failed compile) skips the formatting work.
+        The returned dict is shared with the cache; don't modify it.
+        """
+        key = hashlib.blake2b(
+            json.dumps(json_data, sort_keys=True, default=str).encode('utf-8'), digest_size=16
+        ).digest()
+        resume_data = self._normalize_cache.get(key)
+        if resume_data is None:
+            print("  Validating and cleaning interview responses...")
+            cleaned_data = self.validate_and_clean_all_responses(json_data)
+            resume_data = self.normalize_interview_data(cleaned_data)
+            self._normalize_cache[key] = resume_data
+        return resume_data
+
+    def _write_tex(self, tex_path, content):
+        """Save a .tex file: encode once and write it with a single unbuffered write"""
+        data = memoryview(content.encode('utf-8'))
+        fd = os.open(tex_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0), 0o644)
+        try:
+            while data:
+                data = data[os.write(fd, data):]
+        finally:
+            os.close(fd)
+
+    def _generate_native_pdf(self, resume_data, pdf_path, enhance):
+        """Draw the resume with ReportLab instead of compiling the template."""
+        jobs = resume_data['work_experience']
+        if jobs and enhance:
+            # One AI call for all jobs instead of one per job
+            print(f"  Enhancing accomplishments for {len(jobs)} job(s)...")
+            jobs_accomplishments = self.enhance_all_jobs([job['accomplishments'] for job in jobs])
+        else:
+            jobs_accomplishments = [job['accomplishments'] for job in jobs]
+
+        resume_pdf.write_resume_pdf(resume_data, jobs_accomplishments, pdf_path)
+        print(f"  ✓ PDF written: {os.path.basename(pdf_path)}")
+        return {'pdf': pdf_path}
+
+    def generate_resume(self, json_data, output_filename="resume", enhance=True, compile_pdf=True, keep_tex=False,
+                        engine=None):
         """
         Generate a LaTeX resume from JSON data.
 
@@ -868,18 +1162,17 @@ Enhanced accomplishments:"""
             enhance (bool): Whether to use AI to enhance accomplishments
             compile_pdf (bool): Whether to compile LaTeX to PDF (default: True)
             keep_tex (bool): Whether to keep the .tex file after PDF compilation (default: False)
+            engine (str): "latex" or "reportlab" (default: PDF_ENGINE). ReportLab
+                draws the PDF directly and writes no .tex, so it's only used
+                with compile_pdf=True and keep_tex=False.
 
         Returns:
             dict: Dictionary with 'pdf' and/or 'tex' paths, or None if failed
                   Example: {'pdf': 'path/to/resume.pdf', 'tex': 'path/to/resume.tex'}
         """
         try:
-            # Step 1: Validate and clean all responses
-            print("  Validating and cleaning interview responses...")
-            cleaned_data = self.validate_and_clean_all_responses(json_data)
-
-            # Step 2: Normalize the data format
-            resume_data = self.normalize_interview_data(cleaned_data)
+            # Steps 1-2: Validate and clean all responses, then normalize the data format
+            resume_data = self.prepare_resume_data(json_data)
 
             # Debug: Show what education data was found
             if resume_data['education']:
@@ -887,6 +1180,17 @@ Enhanced accomplishments:"""
             else:
                 print(f"  Education: None (section will be removed)")
 
+            # Prepare output filename
+            if output_filename.endswith('.tex'):
+                output_filename = output_filename[:-4]
+
+            if (engine or PDF_ENGINE) == 'reportlab' and compile_pdf and not keep_tex:
+                if resume_pdf.AVAILABLE:
+                    return self._generate_native_pdf(
+                        resume_data, os.path.join(self.base_path, output_filename + '.pdf'), enhance
+                    )
+                print("  Warning: reportlab is not installed, compiling with LaTeX instead")
+
             # Read the LaTeX template
             template_content = self.read_file("blue_collar_resume_template.tex")
             if not template_content:
@@ -895,21 +1199,25 @@ Enhanced accomplishments:"""
             # Fill template programmatically (AI only enhances accomplishments if requested)
             filled_content = self.fill_template_programmatically(resume_data, template_content, enhance=enhance)
 
-            # Prepare output filename
-            if output_filename.endswith('.tex'):
-                output_filename = output_filename[:-4]
-
             tex_filename = output_filename + '.tex'
             tex_path = os.path.join(self.base_path, tex_filename)
 
-            # Save the .tex file
-            with open(tex_path, 'w', encoding='utf-8') as f:
-                f.write(filled_content)
-
             result = {}
 
             # Compile to PDF if requested
-            if compile_pdf:
+            if compile_pdf and not keep_tex and STREAM_TEX_SOURCE:
+                # The .tex isn't kept, so pdflatex reads it from stdin and it's
+                # only written out when compilation fails
+                pdf_path = self.compile_latex_to_pdf(tex_path, tex_source=filled_content)
+                if pdf_path:
+                    result['pdf'] = pdf_path
+                else:
+                    # If PDF compilation failed, keep the .tex file
+                    self._write_tex(tex_path, filled_content)
+                    result['tex'] = tex_path
+                    print(f"  ✓ LaTeX file saved: {tex_filename}")
+            elif compile_pdf:
+                self._write_tex(tex_path, filled_content)
                 pdf_path = self.compile_latex_to_pdf(tex_path)
                 if pdf_path:
                     result['pdf'] = pdf_path
@@ -928,6 +1236,7 @@ Enhanced accomplishments:"""
                     result['tex'] = tex_path
                     print(f"  ✓ LaTeX file saved: {tex_filename}")
             else:
+                self._write_tex(tex_path, filled_content)
                 result['tex'] = tex_path
 
             return result if result else None
@@ -942,8 +1251,6 @@ Enhanced accomplishments:"""
 
 def main():
     """Main function to run the Resume AI Generator."""
-    import json
-
     print("""
     ╔══════════════════════════════════════════════════════════════════╗
     ║                          RESUME AI GENERATOR                     ║
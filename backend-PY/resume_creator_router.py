@@ -1,14 +1,18 @@
-# main.py
-from fastapi import FastAPI, HTTPException
+# resume_creator_router.py
+import asyncio
+
+from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from resume_creator import generate_resume_from_speech
-import json
-import os
+from storage import JsonStore
 
-app = FastAPI(title="Universal Resume Creator API (Mistral via Ollama)")
+router = APIRouter(tags=["Resume Creator (Mistral via Ollama)"])
 
 DATA_FILE = "resumes.json"  # local file to store saved resumes
 
+# Saved resumes keyed by phone, loaded once and written back in the background
+resume_store = JsonStore(DATA_FILE, {})
+
 
 # --------------------------
 # Model for /generate_resume
@@ -18,19 +22,15 @@ class ResumeSpeechInput(BaseModel):
     responses: dict
 
 
-@app.get("/")
-async def root():
-    return {"message": "Resume Creator API is running!"}
-
-
-@app.post("/generate_resume")
+@router.post("/generate_resume")
 async def generate_resume_endpoint(data: ResumeSpeechInput):
     """
     POST endpoint that accepts speech-to-text JSON input and returns
     a clean, structured resume generated by Mistral (via Ollama HTTP call).
     """
     try:
-        result = generate_resume_from_speech(data.dict())
+        # The Ollama HTTP call blocks (up to 90s), so run it in a worker thread
+        result = await asyncio.to_thread(generate_resume_from_speech, data.model_dump())
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
         return result
@@ -42,7 +42,7 @@ async def generate_resume_endpoint(data: ResumeSpeechInput):
 # NEW: Save and Retrieve Resume Data
 # ================================================================
 
-@app.post("/save_resume")
+@router.post("/save_resume")
 async def save_resume(resume: dict):
     """
     Save a generated resume JSON to a local file (temporary storage).
@@ -51,39 +51,27 @@ async def save_resume(resume: dict):
     if "phone" not in resume:
         raise HTTPException(status_code=400, detail="Missing 'phone' field")
 
-    # Load existing resumes if the file exists
-    data = {}
-    if os.path.exists(DATA_FILE):
-        with open(DATA_FILE, "r", encoding="utf-8") as f:
-            try:
-                data = json.load(f)
-            except json.JSONDecodeError:
-                data = {}
+    # JSON object keys are strings (and GET /resume/{phone} looks them up as
+    # strings), even if the client sent the phone as a number
+    phone = str(resume["phone"])
 
-    # Save/update the entry
-    phone = resume["phone"]
-    data[phone] = resume
-
-    # Write back to file
-    with open(DATA_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # Save/update the entry; the file is rewritten shortly after by the store
+    async with resume_store.lock:
+        resume_store.data[phone] = resume
+    resume_store.mark_dirty()
 
     return {"message": f"Resume saved for {phone}", "resume": resume}
 
 
-@app.get("/resume/{phone}")
+@router.get("/resume/{phone}")
 async def get_resume(phone: str):
     """
     Retrieve a saved resume by phone number.
     """
-    if not os.path.exists(DATA_FILE):
-        raise HTTPException(status_code=404, detail="No resumes found")
+    data = resume_store.data
 
-    with open(DATA_FILE, "r", encoding="utf-8") as f:
-        try:
-            data = json.load(f)
-        except json.JSONDecodeError:
-            raise HTTPException(status_code=500, detail="Corrupted data file")
+    if not data:
+        raise HTTPException(status_code=404, detail="No resumes found")
 
     if phone not in data:
         raise HTTPException(status_code=404, detail=f"No resume found for {phone}")
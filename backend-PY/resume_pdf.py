@@ -0,0 +1,135 @@
+"""
+Native Resume PDFs
+==================
+Draws the blue-collar resume layout (the same sections as
+blue_collar_resume_template.tex) straight to a PDF with ReportLab. There
+is no template to fill and no pdflatex process to start, so a resume
+takes milliseconds instead of a LaTeX compile.
+
+ReportLab is optional: AVAILABLE is False when it isn't installed, and
+ResumeAI falls back to the LaTeX template.
+"""
+
+from xml.sax.saxutils import escape
+
+try:
+    from reportlab.lib import colors
+    from reportlab.lib.enums import TA_CENTER, TA_RIGHT
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import (
+        HRFlowable, ListFlowable, ListItem, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+    )
+    AVAILABLE = True
+except ImportError:
+    AVAILABLE = False
+
+MARGIN = 0.5 * inch
+# SimpleDocTemplate pads its frame by 6pt on every side; margins and table
+# widths account for it so text starts at MARGIN
+FRAME_PADDING = 6
+
+
+def _text(value):
+    """Paragraph markup for a resume field: whitespace collapsed, XML characters escaped"""
+    return escape(' '.join(str(value).split()))
+
+
+def _styles():
+    base = ParagraphStyle('base', fontName='Helvetica', fontSize=10, leading=12)
+    return {
+        'name': ParagraphStyle('name', base, fontName='Helvetica-Bold', fontSize=24, leading=28, alignment=TA_CENTER),
+        'header': ParagraphStyle('header', base, alignment=TA_CENTER),
+        'section': ParagraphStyle('section', base, fontName='Helvetica-Bold', fontSize=13, leading=16, spaceBefore=6),
+        'left': base,
+        'right': ParagraphStyle('right', base, alignment=TA_RIGHT),
+        'item': ParagraphStyle('item', base, fontSize=9.5, leading=11.5),
+    }
+
+
+def _section(story, title, styles):
+    story.append(Paragraph(title, styles['section']))
+    story.append(HRFlowable(width='100%', thickness=0.6, color=colors.black, spaceBefore=1, spaceAfter=4))
+
+
+def _subheading(story, top_left, top_right, bottom_left, bottom_right, width, styles):
+    """Two-row heading: bold name and dates, italic title and location (\\resumeSubheading)"""
+    table = Table(
+        [[Paragraph(f'<b>{top_left}</b>', styles['left']), Paragraph(f'<b>{top_right}</b>', styles['right'])],
+         [Paragraph(f'<i>{bottom_left}</i>', styles['left']), Paragraph(f'<i>{bottom_right}</i>', styles['right'])]],
+        colWidths=[width * 0.7, width * 0.3],
+    )
+    table.setStyle(TableStyle([('LEFTPADDING', (0, 0), (-1, -1), 0), ('RIGHTPADDING', (0, 0), (-1, -1), 0),
+                               ('TOPPADDING', (0, 0), (-1, -1), 0), ('BOTTOMPADDING', (0, 0), (-1, -1), 1)]))
+    story.append(table)
+
+
+def _bullets(story, items, styles, left_indent=14):
+    if items:
+        story.append(ListFlowable(
+            [ListItem(Paragraph(item, styles['item'])) for item in items],
+            bulletType='bullet', start='•', bulletFontSize=6, leftIndent=left_indent,
+        ))
+    story.append(Spacer(1, 4))
+
+
+def write_resume_pdf(resume_data, jobs_accomplishments, pdf_path):
+    """
+    Write a resume PDF from normalized resume data
+
+    Args:
+        resume_data (dict): Output of ResumeAI.prepare_resume_data
+        jobs_accomplishments (list): Accomplishment lines for each job in
+            resume_data['work_experience'] (already AI-enhanced if wanted)
+        pdf_path (str): Where to write the PDF
+    """
+    styles = _styles()
+    margin = MARGIN - FRAME_PADDING
+    doc = SimpleDocTemplate(pdf_path, pagesize=letter, leftMargin=margin, rightMargin=margin,
+                            topMargin=margin, bottomMargin=margin, title='Resume')
+    width = doc.width - 2 * FRAME_PADDING
+    story = []
+
+    # Heading: name, trade, then phone | email | location
+    contact = resume_data['contact_info']
+    story.append(Paragraph(_text(contact['full_name']), styles['name']))
+    story.append(Paragraph(_text(contact['job_title']), styles['header']))
+    details = [_text(contact['phone_number'])]
+    if contact['email'].lower() != 'no':
+        email = _text(contact['email'])
+        details.append(f'<a href="mailto:{escape(email, {chr(34): "&quot;"})}">{email}</a>')
+    details.append(_text(contact['location']))
+    story.append(Paragraph(' | '.join(details), styles['header']))
+    story.append(Spacer(1, 6))
+
+    if resume_data['work_experience']:
+        _section(story, 'Work Experience', styles)
+        for job, accomplishments in zip(resume_data['work_experience'], jobs_accomplishments):
+            _subheading(story, _text(job['company']), f"{_text(job['start_date'])} - {_text(job['end_date'])}",
+                        _text(job['title']), _text(job['location']), width, styles)
+            _bullets(story, [_text(acc) for acc in accomplishments if acc and acc.strip()], styles)
+
+    skills = resume_data['skills']
+    _section(story, 'Skills', styles)
+    _bullets(story, [
+        f"<b>Technical Skills:</b> {', '.join(_text(s) for s in skills['technical_skills'])}",
+        f"<b>Certifications &amp; Licenses:</b> {', '.join(_text(c) for c in skills['certifications_licenses'])}",
+        f"<b>Core Competencies:</b> {', '.join(_text(c) for c in skills['core_competencies'])}",
+    ], styles)
+
+    if resume_data['education']:
+        edu = resume_data['education'][0]
+        _section(story, 'Education', styles)
+        _subheading(story, _text(edu['institution']), _text(edu['date']),
+                    _text(edu['credential']), _text(edu['location']), width, styles)
+
+    if resume_data['certifications_detailed']:
+        _section(story, 'Training &amp; Certifications', styles)
+        items = []
+        for cert in resume_data['certifications_detailed']:
+            details = f" - {_text(cert['details'])}" if cert['details'] and cert['details'].lower() != 'no' else ''
+            items.append(f"<b>{_text(cert['name'])}</b> - {_text(cert['organization'])}, {_text(cert['date'])}{details}")
+        _bullets(story, items, styles, left_indent=10)
+
+    doc.build(story)
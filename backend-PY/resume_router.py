@@ -13,12 +13,13 @@ Endpoints:
 - GET  /resume/health - Health check
 """
 
+import asyncio
+import io
 import os
+import threading
 import time
 import json
-import shutil
 import logging
-import uuid
 from typing import Optional
 from datetime import datetime
 
@@ -28,6 +29,7 @@ from pydantic import BaseModel
 
 # Import ResumeAI
 from resumeAI import ResumeAI
+from transcription import SHORT_ANSWER_OPTIONS, transcribe_async
 
 logger = logging.getLogger(__name__)
 
@@ -40,6 +42,9 @@ router = APIRouter(
     tags=["Resume"]
 )
 
+# Ollama model used to enhance resume text (qwen2.5-coder:7b is the Q4_K_M build)
+RESUME_AI_MODEL = os.getenv("RESUME_AI_MODEL", "qwen2.5-coder:7b")
+
 # Global references (will be set by main.py)
 whisper_model = None
 resume_ai = None
@@ -57,8 +62,9 @@ def set_models(whisper, ollama=None):
     global whisper_model, resume_ai, ollama_client
     whisper_model = whisper
     ollama_client = ollama
-    # Initialize ResumeAI
-    resume_ai = ResumeAI(model_name="qwen2.5-coder:7b")
+    # Initialize ResumeAI and load its model in the background
+    resume_ai = ResumeAI(model_name=RESUME_AI_MODEL)
+    threading.Thread(target=resume_ai.warm_up, name="resume-ai-warmup", daemon=True).start()
     logger.info("[Resume] AI models configured")
 
 
@@ -233,7 +239,7 @@ async def transcribe_audio(
     Transcribe audio for resume question responses
 
     **Process:**
-    1. Save uploaded audio temporarily
+    1. Read uploaded audio into memory
     2. Transcribe with Whisper (bilingual English/Spanish)
     3. Return cleaned transcript
 
@@ -258,20 +264,15 @@ async def transcribe_audio(
     logger.info("[Resume] === NEW TRANSCRIPTION REQUEST ===")
     logger.info(f"[Resume] Audio file: {audio_file.filename}")
 
-    temp_audio_path = None
-
     try:
         # ===========================
-        # Step 1: Save Audio File
+        # Step 1: Read Audio
         # ===========================
-        temp_audio_path = f"temp_resume_{uuid.uuid4()}.webm"
-
-        logger.info(f"[Resume] Saving audio to: {temp_audio_path}")
-        with open(temp_audio_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+        # faster-whisper decodes file-like objects, so no temp file is needed
+        audio_data = await audio_file.read()
 
-        file_size = os.path.getsize(temp_audio_path)
-        logger.info(f"[Resume] ✓ Audio saved ({file_size} bytes)")
+        file_size = len(audio_data)
+        logger.info(f"[Resume] ✓ Audio received ({file_size} bytes)")
 
         if file_size == 0:
             logger.error("[Resume] ✗ Audio file is empty!")
@@ -287,14 +288,14 @@ async def transcribe_audio(
         logger.info("[Resume] Transcribing with Whisper...")
         start_time = time.time()
 
-        segments, info = whisper_model.transcribe(
-            temp_audio_path,
-            beam_size=5,
+        # Runs on the shared Whisper thread so the event loop stays responsive
+        transcript, info = await transcribe_async(
+            whisper_model,
+            io.BytesIO(audio_data),
             task="transcribe",
-            language=None  # Auto-detect English/Spanish
+            language=None,  # Auto-detect English/Spanish
+            **SHORT_ANSWER_OPTIONS
         )
-
-        transcript = " ".join([s.text for s in segments]).strip()
         transcription_time = time.time() - start_time
 
         language = info.language if hasattr(info, 'language') else "unknown"
@@ -334,15 +335,6 @@ async def transcribe_audio(
         logger.error("=" * 60)
         raise HTTPException(status_code=500, detail=str(e))
 
-    finally:
-        # Clean up temp file
-        if temp_audio_path and os.path.exists(temp_audio_path):
-            try:
-                os.remove(temp_audio_path)
-                logger.info(f"[Resume] ✓ Temp file removed: {temp_audio_path}")
-            except Exception as e:
-                logger.warning(f"[Resume] ! Could not remove temp file: {e}")
-
 
 @router.post("/validate-response")
 async def validate_response(request: ValidateResponseRequest):
@@ -655,12 +647,12 @@ async def generate_resume(request: ResumeGenerateRequest):
     logger.info("[Resume] FULL JSON REQUEST:")
     logger.info("-" * 60)
     try:
-        pretty_json = json.dumps(request.dict(), indent=2, ensure_ascii=False)
+        pretty_json = json.dumps(request.model_dump(), indent=2, ensure_ascii=False)
         for line in pretty_json.split('\n'):
             logger.info(f"[Resume]   {line}")
     except Exception as e:
         logger.warning(f"[Resume] Could not pretty-print JSON: {e}")
-        logger.info(f"[Resume]   {request.dict()}")
+        logger.info(f"[Resume]   {request.model_dump()}")
     logger.info("-" * 60)
 
     # Log individual sections with question counts
@@ -722,9 +714,11 @@ async def generate_resume(request: ResumeGenerateRequest):
 
         logger.info(f"[Resume] Generating resume: {output_filename}")
 
-        # Generate resume PDF
-        result = resume_ai.generate_resume(
-            json_data=request.dict(),
+        # Generate resume PDF (writes the .tex, runs pdflatex and the AI
+        # enhancement calls, so it runs in a worker thread)
+        result = await asyncio.to_thread(
+            resume_ai.generate_resume,
+            json_data=request.model_dump(),
             output_filename=output_filename,
             enhance=True,  # Use AI to enhance accomplishments
             compile_pdf=True,  # Compile to PDF
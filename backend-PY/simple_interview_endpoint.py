@@ -4,21 +4,66 @@ Simple Interview Endpoint - Uses skill_interview.py logic with database job
 
 from fastapi import APIRouter, HTTPException, UploadFile, File
 from pydantic import BaseModel
-from typing import Dict, List, Optional
+from typing import List, Optional
+from cachetools import TTLCache
+import asyncio
+import io
 import logging
+import os
+import threading
+import time
 import uuid
+from datetime import datetime, timedelta
 
 from database import supabase
 from skill_interview import OllamaClient, SkillAnalyzer
 from RTtranscribe import StreamingTranscriber
-import threading
-import time
-from datetime import datetime, timedelta
+from transcription import TRANSCRIBE_POOL, SHORT_ANSWER_OPTIONS, WHISPER_CPU_THREADS, load_audio, transcribe_text
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/simple-interview", tags=["Simple Interview"])
 
+# large-v3-turbo keeps large-v3's multilingual encoder with a 4-layer decoder
+# (vs 32), roughly halving transcription time on short answers. Set
+# SIMPLE_INTERVIEW_WHISPER_MODEL=large-v3 where accuracy matters more than
+# latency. (distil-large-v3 is English-only, so it would break Spanish answers.)
+# Separate from main.py's WHISPER_MODEL, which picks the shared model used by
+# the other interview and resume routes.
+WHISPER_MODEL = os.getenv("SIMPLE_INTERVIEW_WHISPER_MODEL", "large-v3-turbo")
+
+_whisper_model = None
+_whisper_model_lock = threading.Lock()
+
+
+def get_whisper_model():
+    """Load the Whisper model on first use and reuse it for every session"""
+    global _whisper_model
+    with _whisper_model_lock:
+        if _whisper_model is None:
+            from faster_whisper import WhisperModel
+            import ctranslate2
+
+            # int8 weights with float16 activations on GPU; plain int8 on the
+            # CPU fallback. num_workers stays at 1 because every call goes
+            # through the single TRANSCRIBE_POOL thread.
+            device = "cuda" if ctranslate2.get_cuda_device_count() > 0 else "cpu"
+            compute_type = "int8_float16" if device == "cuda" else "int8"
+            logger.info(f"Loading faster-whisper '{WHISPER_MODEL}' model ({device}, {compute_type})...")
+            _whisper_model = WhisperModel(
+                WHISPER_MODEL,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=WHISPER_CPU_THREADS,
+                num_workers=1
+            )
+        return _whisper_model
+
+
+# One Ollama client (and its pooled HTTP connection) shared by every session;
+# SkillAnalyzer keeps per-session skill state, so each session gets its own
+ollama_client = OllamaClient(model="mistral:7b")
+
 
 class StartInterviewRequest(BaseModel):
     job_id: str
@@ -30,7 +75,7 @@ class InterviewSession:
 
     def __init__(self, job_description: str, session_id: str):
         self.session_id = session_id
-        self.ollama = OllamaClient(model="mistral:7b")
+        self.ollama = ollama_client
         self.analyzer = SkillAnalyzer(self.ollama)
 
         # Extract skills and generate questions
@@ -62,16 +107,16 @@ class InterviewSession:
             "transcriptions": self.transcriptions
         }
 
-    def process_audio(self, audio_file_path: str):
+    def process_audio(self, audio_file):
         """Process uploaded audio and detect skills"""
-        from faster_whisper import WhisperModel
-
-        # Load Whisper model
-        model = WhisperModel("large-v3", device="cuda", compute_type="float16")
+        model = get_whisper_model()
 
-        # Transcribe
-        segments, info = model.transcribe(audio_file_path, beam_size=5, language=None)
-        transcript = " ".join([s.text for s in segments]).strip()
+        # Decode here (this method already runs off the event loop), then
+        # transcribe on the shared Whisper thread
+        audio = load_audio(audio_file)
+        transcript, info = TRANSCRIBE_POOL.submit(
+            transcribe_text, model, audio, language=None, **SHORT_ANSWER_OPTIONS
+        ).result()
 
         language = info.language if hasattr(info, 'language') else "unknown"
         timestamp = datetime.now().strftime("%H:%M:%S")
@@ -111,8 +156,11 @@ class InterviewSession:
         }
 
 
-# Store active sessions
-sessions: Dict[str, InterviewSession] = {}
+# Active sessions; an abandoned session expires an hour after its last use,
+# and the least recently used one is evicted once MAX_SESSIONS are open
+MAX_SESSIONS = 256
+SESSION_TTL_SECONDS = 3600
+sessions: TTLCache = TTLCache(maxsize=MAX_SESSIONS, ttl=SESSION_TTL_SECONDS)
 
 
 @router.post("/start/{job_id}")
@@ -158,10 +206,10 @@ async def start_simple_interview(job_id: str):
 @router.get("/status/{session_id}")
 async def get_interview_status(session_id: str):
     """Get current interview progress"""
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = sessions[session_id]
     return session.get_status()
 
 
@@ -170,38 +218,29 @@ async def submit_answer(session_id: str, audio_file: UploadFile = File(...)):
     """
     Submit audio answer (same as current endpoint)
     """
-    if session_id not in sessions:
+    session = sessions.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
+    # Re-insert to restart the session's TTL
+    sessions[session_id] = session
 
-    session = sessions[session_id]
-
-    # Save audio file
-    import shutil
-    import os
-
-    temp_path = f"temp_{session_id}_{len(session.transcriptions)}.webm"
-    try:
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(audio_file.file, buffer)
+    # Keep the upload in memory; faster-whisper decodes file-like objects
+    audio_data = await audio_file.read()
 
-        # Process audio
-        result = session.process_audio(temp_path)
+    # Process audio (Whisper and Ollama calls block, so run them in a worker thread)
+    result = await asyncio.to_thread(session.process_audio, io.BytesIO(audio_data))
 
-        # Get updated status
-        status = session.get_status()
+    # Get updated status
+    status = session.get_status()
 
-        return {
-            **result,
-            "progress": {
-                "detected": status["detected_count"],
-                "total": status["total_skills"],
-                "percentage": status["progress_percentage"]
-            }
+    return {
+        **result,
+        "progress": {
+            "detected": status["detected_count"],
+            "total": status["total_skills"],
+            "percentage": status["progress_percentage"]
         }
-
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+    }
 
 
 @router.post("/complete/{session_id}")
@@ -209,13 +248,11 @@ async def complete_simple_interview(session_id: str):
     """
     Get final report and close session
     """
-    if session_id not in sessions:
+    # Cleanup session
+    session = sessions.pop(session_id, None)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    session = sessions[session_id]
     report = session.get_final_report()
 
-    # Cleanup session
-    del sessions[session_id]
-
     return report
@@ -41,7 +41,10 @@ HOW IT WORKS:
 """
 
 import json
+import os
+import re
 import time
+import orjson
 import requests
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
@@ -80,6 +83,64 @@ Requirements:
 - US work authorization required (OPT/CPT candidates accepted)
 """
 
+# Shared by detect_skills_in_text and the fused cleanup_and_detect prompt
+SKILL_DETECTION_RULES = """You are an expert at analyzing blue collar and construction worker interviews.
+
+Your task is to identify which skills from the provided list the candidate has ACTUALLY DEMONSTRATED EXPERIENCE with.
+
+CRITICAL: The candidate must describe DOING SOMETHING that requires the skill, not just mention the skill name!
+
+VALID DETECTION - Candidate describes actual experience or actions:
+[YES] "I've been framing houses for 5 years" → Carpentry (describes doing carpentry work)
+[YES] "I operate forklifts to move materials around the warehouse" → Forklift Operation (describes operating)
+[YES] "I got my OSHA 10 certification last year" → OSHA 10 (describes having certification)
+[YES] "I read blueprints every day to know what to build" → Blueprint Reading (describes using blueprints)
+[YES] "I've installed plumbing in over 30 homes" → Plumbing (describes installation work)
+[YES] "I weld metal pipes and frames" → Welding (describes welding activity)
+[YES] "I use power tools like drills and saws daily" → Power Tool Operation (describes using tools)
+
+INVALID DETECTION - Just mentioning keywords without experience:
+[NO] "The job posting mentioned carpentry" → NOT Carpentry (just referencing the word)
+[NO] "I'm interested in learning welding" → NOT Welding (wants to learn, doesn't have experience)
+[NO] "Forklift operation sounds interesting" → NOT Forklift Operation (just commenting on it)
+[NO] "I've seen people use blueprints" → NOT Blueprint Reading (observed, not done)
+[NO] "My friend does plumbing" → NOT Plumbing (someone else does it)
+
+EXPERIENCE INDICATORS (must be present):
+- Action verbs: "I do", "I've done", "I worked on", "I operated", "I built", "I installed", "I have"
+- Time/duration: "for X years", "since 2020", "daily", "every day", "regularly"
+- Specific examples: "I built X", "I worked on Y project", "I handle Z tasks"
+- Certifications/licenses: "I'm certified", "I have a license", "I completed training"
+- Professional identity: "I'm a carpenter" (claims to be a professional in that role)
+
+Match skills flexibly based on meaning, but ONLY if they describe actual experience or ability."""
+
+CLEANUP_AND_DETECT_SYSTEM_PROMPT = """You process transcribed answers from job interviews in two steps.
+
+STEP 1 - Fix any transcription errors (misheard words, homophones, missing punctuation,
+run-on sentences, capitalization, misheard technical terms) while preserving the original meaning.
+
+STEP 2 - Analyze the corrected statement for skills:
+
+""" + SKILL_DETECTION_RULES + """
+
+Return ONLY a JSON object with two fields:
+{"cleaned": "<corrected text>", "skills": ["<exact skill name>", ...]}
+Use exact skill names from the list (just the skill, not the category).
+If no skills are detected, use an empty list."""
+
+
+def cleanup_and_detect_prompt(text: str, skill_names: List[str]) -> str:
+    """User prompt for OllamaClient.cleanup_and_detect (the transcript comes last so partial text shares its prefix)"""
+    skills_list = "\n- ".join(skill_names)
+    return f"""AVAILABLE SKILLS TO DETECT:
+- {skills_list}
+
+CANDIDATE'S STATEMENT (raw transcription):
+"{text}"
+
+Return the JSON object:"""
+
 # ============================================================================
 # FEATURES ENABLED:
 # - Automatic skill extraction from job description
@@ -90,27 +151,29 @@ Requirements:
 # ============================================================================
 
 
+# JSON arrays wrapped in markdown code, tried in order. Compiled once because
+# every skill-detection response goes through extract_json_from_response.
+CODE_BLOCK_PATTERNS = (
+    re.compile(r'```json\s*(\[.*?\])\s*```', re.DOTALL),
+    re.compile(r'```\s*(\[.*?\])\s*```', re.DOTALL),
+    re.compile(r'`(\[.*?])`', re.DOTALL),
+)
+
+
 def extract_json_from_response(text: str) -> Optional[str]:
     """Extract JSON from various response formats (code blocks, plain text, etc.)"""
-    import re
-
     if not text:
         return None
 
     # Remove common markdown artifacts
     text = text.strip()
 
-    # Try to find JSON in code blocks first
-    code_block_patterns = [
-        r'```json\s*(\[.*?\])\s*```',
-        r'```\s*(\[.*?\])\s*```',
-        r'`(\[.*?])`'
-    ]
-
-    for pattern in code_block_patterns:
-        match = re.search(pattern, text, re.DOTALL)
-        if match:
-            return match.group(1)
+    # Try to find JSON in code blocks first (skip the scans when there are no backticks)
+    if '`' in text:
+        for pattern in CODE_BLOCK_PATTERNS:
+            match = pattern.search(text)
+            if match:
+                return match.group(1)
 
     # Try to find a complete JSON array by counting brackets
     # This handles cases where there's extra text after the array
@@ -157,33 +220,40 @@ class OllamaClient:
     def __init__(self, base_url="http://localhost:11434", model="mistral:7b"):
         self.base_url = base_url
         self.model = model
+        # Reuse keep-alive connections to Ollama across calls
+        self.session = requests.Session()
+        self.session.headers["Content-Type"] = "application/json"
 
-    def generate(self, prompt: str, system: Optional[str] = None) -> str:
-        """Generate text using Ollama"""
+    def generate(self, prompt: str, system: Optional[str] = None, format: Optional[str] = None) -> str:
+        """Generate text using Ollama (format="json" enables Ollama's JSON mode)"""
         url = f"{self.base_url}/api/generate"
 
         payload = {
             "model": self.model,
             "prompt": prompt,
-            "stream": False
+            "stream": False,
+            # Keep the model loaded between calls so prompts never wait on a reload
+            "keep_alive": -1
         }
 
         if system:
             payload["system"] = system
+        if format:
+            payload["format"] = format
 
         try:
-            response = requests.post(url, json=payload, timeout=120)
+            response = self.session.post(url, data=orjson.dumps(payload), timeout=(2, 120))
             response.raise_for_status()
-            result = response.json()
+            result = orjson.loads(response.content)
             return result.get("response", "").strip()
-        except requests.exceptions.RequestException as e:
+        except (requests.exceptions.RequestException, orjson.JSONDecodeError) as e:
             print(f"Error communicating with Ollama: {e}")
             return ""
 
     def check_connection(self) -> bool:
         """Check if Ollama is running"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
             return response.status_code == 200
         except:
             return False
@@ -217,6 +287,61 @@ Corrected text:"""
             # If cleanup fails, return original text
             return text
 
+    def warm_prompt(self, prompt: str = "", system: Optional[str] = None):
+        """
+        Send a 1-token request so the model is loaded and the prompt prefix is
+        already in Ollama's cache when the real request arrives
+        keep_alive=-1 keeps the model resident between requests
+        """
+        payload = {
+            "model": self.model,
+            "prompt": prompt,
+            "stream": False,
+            "keep_alive": -1,
+            "options": {"num_predict": 1}
+        }
+
+        if system:
+            payload["system"] = system
+
+        try:
+            self.session.post(f"{self.base_url}/api/generate", data=orjson.dumps(payload), timeout=120)
+        except requests.exceptions.RequestException as e:
+            print(f"Error warming up Ollama: {e}")
+
+    def cleanup_and_detect(self, text: str, skill_names: List[str]) -> Dict:
+        """
+        Clean up a transcription and detect demonstrated skills in a single call
+        Returns {"cleaned": str, "skills": [skill names]}; falls back to the
+        original text and no skills if the response cannot be parsed
+        """
+        result = {"cleaned": text, "skills": []}
+        if not text or len(text.strip()) < 5:
+            return result
+
+        response = self.generate(
+            cleanup_and_detect_prompt(text, skill_names),
+            system=CLEANUP_AND_DETECT_SYSTEM_PROMPT,
+            format="json"
+        )
+
+        try:
+            parsed = orjson.loads(response)
+        except orjson.JSONDecodeError:
+            return result
+        if not isinstance(parsed, dict):
+            return result
+
+        cleaned = parsed.get("cleaned")
+        if isinstance(cleaned, str) and cleaned.strip():
+            result["cleaned"] = cleaned.strip()
+
+        skills = parsed.get("skills")
+        if isinstance(skills, list):
+            result["skills"] = [s for s in skills if isinstance(s, str)]
+
+        return result
+
 
 class SkillAnalyzer:
     """Analyzes job descriptions and detects skills in conversation"""
@@ -473,36 +598,7 @@ Return a JSON array of questions (one per skill) in the same order:
         skills_with_categories = [f"{s['skill']} ({s['category']})" for s in self.skills]
         skills_list = "\n- ".join(skills_with_categories)
 
-        system_prompt = """You are an expert at analyzing blue collar and construction worker interviews.
-
-Your task is to identify which skills from the provided list the candidate has ACTUALLY DEMONSTRATED EXPERIENCE with.
-
-CRITICAL: The candidate must describe DOING SOMETHING that requires the skill, not just mention the skill name!
-
-VALID DETECTION - Candidate describes actual experience or actions:
-[YES] "I've been framing houses for 5 years" → Carpentry (describes doing carpentry work)
-[YES] "I operate forklifts to move materials around the warehouse" → Forklift Operation (describes operating)
-[YES] "I got my OSHA 10 certification last year" → OSHA 10 (describes having certification)
-[YES] "I read blueprints every day to know what to build" → Blueprint Reading (describes using blueprints)
-[YES] "I've installed plumbing in over 30 homes" → Plumbing (describes installation work)
-[YES] "I weld metal pipes and frames" → Welding (describes welding activity)
-[YES] "I use power tools like drills and saws daily" → Power Tool Operation (describes using tools)
-
-INVALID DETECTION - Just mentioning keywords without experience:
-[NO] "The job posting mentioned carpentry" → NOT Carpentry (just referencing the word)
-[NO] "I'm interested in learning welding" → NOT Welding (wants to learn, doesn't have experience)
-[NO] "Forklift operation sounds interesting" → NOT Forklift Operation (just commenting on it)
-[NO] "I've seen people use blueprints" → NOT Blueprint Reading (observed, not done)
-[NO] "My friend does plumbing" → NOT Plumbing (someone else does it)
-
-EXPERIENCE INDICATORS (must be present):
-- Action verbs: "I do", "I've done", "I worked on", "I operated", "I built", "I installed", "I have"
-- Time/duration: "for X years", "since 2020", "daily", "every day", "regularly"
-- Specific examples: "I built X", "I worked on Y project", "I handle Z tasks"
-- Certifications/licenses: "I'm certified", "I have a license", "I completed training"
-- Professional identity: "I'm a carpenter" (claims to be a professional in that role)
-
-Match skills flexibly based on meaning, but ONLY if they describe actual experience or ability.
+        system_prompt = SKILL_DETECTION_RULES + """
 
 Return ONLY a valid JSON array of exact skill names from the list (just the skill, not the category).
 If no skills detected, return: []
@@ -549,7 +645,10 @@ Return JSON array with exact skill names only:"""
             # of requiring actual experience descriptions
             pass
 
-        # Update skill status for detected skills
+        return self.record_detected_skills(detected_skills, timestamp, text)
+
+    def record_detected_skills(self, detected_skills: List[str], timestamp: str, text: str) -> List[str]:
+        """Mark detected skills as present and record where they were mentioned"""
         for skill_name in detected_skills:
             if skill_name in self.skill_status:
                 if not self.skill_status[skill_name]["has"]:
@@ -893,7 +992,7 @@ def main():
 
     # Transcriber configuration
     CONFIG = {
-        "model_name": "large-v3",  # Options: tiny, base, small, medium, large-v2, large-v3
+        "model_name": os.getenv("WHISPER_MODEL", "large-v3-turbo"),  # Options: tiny, base, small, medium, large-v2, large-v3, large-v3-turbo
                                # Smaller = faster, Larger = more accurate
         "sample_rate": 16000,
         "chunk_duration": 3,
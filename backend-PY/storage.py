@@ -0,0 +1,191 @@
+"""
+Local Storage
+=============
+Local persistence used by the API: small JSON files (saved resumes) and
+a SQLite database for questionnaire responses.
+"""
+
+import asyncio
+import orjson
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+RESPONSES_FILE = "user_responses.json"
+
+# Phone numbers are stored and looked up as bare digits
+_NONDIGIT_RE = re.compile(r"\D+")
+
+
+def normalize_phone(phone_number: str) -> str:
+    """Strip formatting (spaces, dashes, parentheses) from a phone number"""
+    return _NONDIGIT_RE.sub("", phone_number)
+
+
+def load_json(path: str, default):
+    """
+    Load a JSON file, returning `default` if it does not exist
+
+    Raises orjson.JSONDecodeError (a json.JSONDecodeError subclass) if the file is corrupted
+    """
+    if not os.path.exists(path):
+        return default
+    with open(path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+def save_json(path: str, data):
+    """Write data to a JSON file (2-space indent), replacing its contents"""
+    write_bytes_atomic(path, orjson.dumps(data, option=orjson.OPT_INDENT_2))
+
+
+def write_bytes_atomic(path: str, content: bytes):
+    """Write to a temp file and rename it over `path` so readers never see a partial file"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+
+class JsonStore:
+    """
+    A JSON file kept in memory with a debounced write-back
+
+    The file is read once. Handlers mutate `data` while holding `lock` and
+    then call mark_dirty(); changes made within `flush_delay` seconds of
+    each other are written out together in one atomic rewrite. Write-backs
+    are compact (no indent); use save_json for a pretty-printed export.
+    """
+
+    def __init__(self, path: str, default, flush_delay: float = 0.25):
+        self.path = path
+        self.flush_delay = flush_delay
+        try:
+            self.data = load_json(path, default)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"[Storage] {path} is corrupted, starting empty: {e}")
+            self.data = default
+        self.lock = asyncio.Lock()
+        self._dirty = asyncio.Event()
+        self._flush_task = None
+
+    def mark_dirty(self):
+        """Schedule a write-back (call from the running event loop)"""
+        self._dirty.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def flush(self):
+        """Write the current data to disk"""
+        async with self.lock:
+            content = orjson.dumps(self.data)
+        await asyncio.to_thread(write_bytes_atomic, self.path, content)
+
+    async def _flush_loop(self):
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.flush_delay)
+            self._dirty.clear()
+            try:
+                await self.flush()
+            except OSError as e:
+                logger.error(f"[Storage] Failed to write {self.path}: {e}")
+                self._dirty.set()
+            except Exception:
+                # e.g. data orjson can't serialize; keep the loop alive for later saves
+                logger.exception(f"[Storage] Failed to write {self.path}")
+
+    async def stop(self):
+        """Stop the write-back task and write any pending changes"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        if self._dirty.is_set():
+            self._dirty.clear()
+            await self.flush()
+
+
+# --- Questionnaire responses ---
+
+RESPONSES_DB = "responses.db"
+
+
+class ResponseStore:
+    """
+    Questionnaire responses stored in SQLite (WAL mode)
+
+    Each answer is one row keyed by (phone, qid), so saving an answer is a
+    single INSERT OR REPLACE instead of rewriting every user's responses.
+    Responses from an existing user_responses.json are imported on first use.
+    """
+
+    def __init__(self, path: str = RESPONSES_DB, legacy_json_path: str = RESPONSES_FILE):
+        self.path = path
+        # One shared connection; the lock serializes access from worker threads
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "phone TEXT NOT NULL, qid TEXT NOT NULL, text TEXT, ts REAL, "
+            "PRIMARY KEY (phone, qid))"
+        )
+        self.conn.commit()
+        self._import_json(legacy_json_path)
+
+    def _import_json(self, json_path: str):
+        """Copy responses from the old JSON file into an empty database"""
+        if self.conn.execute("SELECT 1 FROM responses LIMIT 1").fetchone():
+            return
+        try:
+            legacy = load_json(json_path, None)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"[Storage] Could not import {json_path}: {e}")
+            return
+        if not legacy:
+            return
+
+        now = time.time()
+        rows = [
+            (normalize_phone(user["phone_number"]), qid, text, now)
+            for user in legacy.get("users", [])
+            for qid, text in user.get("responses", {}).items()
+        ]
+        with self.lock, self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?)", rows)
+        logger.info(f"[Storage] Imported {len(rows)} responses from {json_path}")
+
+    def user_exists(self, phone_number: str) -> bool:
+        with self.lock:
+            row = self.conn.execute("SELECT 1 FROM responses WHERE phone = ? LIMIT 1", (phone_number,)).fetchone()
+        return row is not None
+
+    def save_response(self, phone_number: str, qid: str, text: str):
+        """Insert or overwrite one answer"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses (phone, qid, text, ts) VALUES (?, ?, ?, ?)",
+                (phone_number, qid, text, time.time()),
+            )
+
+    def get_responses(self, phone_number: str) -> dict:
+        """A user's answers as {qid: text}, in the order they were saved"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT qid, text FROM responses WHERE phone = ? ORDER BY ts", (phone_number,)
+            ).fetchall()
+        return dict(rows)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,64 @@
+"""
+pdflatex Processes
+==================
+run_pdflatex() and start_pdflatex() start every pdflatex below the web
+service's CPU priority and in its own process group, so a timed-out run is
+killed along with anything it started.
+
+AVAILABLE is True where pdflatex can read its input from /dev/stdin (POSIX).
+"""
+
+import contextlib
+import os
+import signal
+import subprocess
+
+AVAILABLE = os.name == "posix" and os.path.exists("/dev/stdin")
+
+# Niceness for pdflatex processes (RESUMEAI_PDFLATEX_NICE=0 keeps the server's
+# priority); on Windows any non-zero value means BELOW_NORMAL_PRIORITY_CLASS
+PDFLATEX_NICE = int(os.getenv("RESUMEAI_PDFLATEX_NICE", "10"))
+
+
+def start_pdflatex(args, **kwargs) -> subprocess.Popen:
+    """subprocess.Popen for pdflatex, at PDFLATEX_NICE and in a new session"""
+    if os.name == "nt":
+        if PDFLATEX_NICE:
+            kwargs["creationflags"] = kwargs.get("creationflags", 0) | subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    else:
+        kwargs["start_new_session"] = True
+    proc = subprocess.Popen(args, **kwargs)
+    if PDFLATEX_NICE and hasattr(os, "setpriority"):
+        # Set from the parent (preexec_fn isn't safe with threads); pdflatex
+        # is still starting up, and an error means it already exited
+        with contextlib.suppress(OSError):
+            os.setpriority(os.PRIO_PROCESS, proc.pid, PDFLATEX_NICE)
+    return proc
+
+
+def kill(proc: subprocess.Popen):
+    """Kill a process from start_pdflatex, with its process group, and reap it"""
+    if os.name == "nt":
+        proc.kill()
+    else:
+        with contextlib.suppress(ProcessLookupError):
+            os.killpg(proc.pid, signal.SIGKILL)
+    proc.wait()
+
+
+def run_pdflatex(args, input: bytes, timeout: float, **kwargs) -> int:
+    """
+    Run pdflatex to completion with `input` on stdin and its output discarded
+
+    Returns the exit code; kills it and raises subprocess.TimeoutExpired if it
+    runs longer than `timeout`.
+    """
+    proc = start_pdflatex(args, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+                          stderr=subprocess.DEVNULL, **kwargs)
+    try:
+        proc.communicate(input, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        kill(proc)
+        raise
+    return proc.returncode
+
@@ -0,0 +1,106 @@
+"""
+Whisper Transcription Worker
+============================
+Shared worker thread for faster-whisper calls. Every endpoint that
+transcribes audio (main app and routers) submits its work here, so the
+event loop never blocks on Whisper and GPU/CPU work is never oversubscribed.
+
+Uploads are decoded to PCM on a separate pool first, so the next upload can
+be decoded while the Whisper thread is busy with the current one.
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import av
+import numpy as np
+
+# CPU threads per Whisper call, shared by every model in the process: this
+# process's share of the cores (one model copy per uvicorn worker) minus one
+# left for the event loop. Must be set before ctranslate2 is imported so its
+# OpenMP runtime picks it up.
+WHISPER_CPU_THREADS = int(os.getenv(
+    "WHISPER_CPU_THREADS",
+    max(1, (os.cpu_count() or 4) // int(os.getenv("WEB_CONCURRENCY", "1")) - 1)
+))
+os.environ.setdefault("OMP_NUM_THREADS", str(WHISPER_CPU_THREADS))
+
+# All Whisper calls run on one dedicated thread: CTranslate2 already spreads a
+# single call across cores, and the event loop stays free while it works
+TRANSCRIBE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="whisper")
+
+# Container decoding (webm/ogg -> 16 kHz PCM) is light CPU work
+DECODE_POOL = ThreadPoolExecutor(max_workers=2, thread_name_prefix="decode")
+
+SAMPLE_RATE = 16000
+
+# Decoding options for short spoken answers: greedy decoding, VAD skips
+# silence, and each clip is decoded independently
+SHORT_ANSWER_OPTIONS = {
+    "beam_size": 1,
+    "best_of": 1,
+    "vad_filter": True,
+    "vad_parameters": {"min_silence_duration_ms": 500},
+    "condition_on_previous_text": False,
+    "temperature": 0.0,
+}
+
+
+def load_audio(input_file, sampling_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode an audio file (webm, wav, ...) to mono float32 samples in-process with PyAV
+    Accepts a path or a file-like object; the result goes straight to WhisperModel.transcribe
+    """
+    resampler = av.AudioResampler(format="s16", layout="mono", rate=sampling_rate)
+    chunks = []
+    with av.open(input_file) as container:
+        stream = container.streams.audio[0]
+        for frame in container.decode(stream):
+            for resampled in resampler.resample(frame):
+                chunks.append(resampled.to_ndarray().reshape(-1))
+        # Flush samples still buffered in the resampler
+        for resampled in resampler.resample(None):
+            chunks.append(resampled.to_ndarray().reshape(-1))
+
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    return np.concatenate(chunks).astype(np.float32) / 32768.0
+
+
+async def decode_async(input_file, sampling_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """Run load_audio on DECODE_POOL"""
+    return await asyncio.get_running_loop().run_in_executor(
+        DECODE_POOL, load_audio, input_file, sampling_rate
+    )
+
+
+def transcribe_text(whisper, audio, on_first_segment=None, **options):
+    """
+    Transcribe audio and return (text, info)
+
+    faster-whisper decodes lazily while segments are iterated, so the
+    segments are consumed here, on the calling (worker) thread.
+    on_first_segment(segment) is called as soon as the first segment is
+    decoded, while the rest of the audio is still being transcribed
+    """
+    segments, info = whisper.transcribe(audio, **options)
+    texts = []
+    for segment in segments:
+        if not texts and on_first_segment is not None:
+            on_first_segment(segment)
+        texts.append(segment.text)
+    return " ".join(texts).strip(), info
+
+
+async def transcribe_async(whisper, audio, **options):
+    """
+    Decode audio on DECODE_POOL (unless it is already PCM), then run
+    transcribe_text on TRANSCRIBE_POOL and await the (text, info) result
+    """
+    if not isinstance(audio, np.ndarray):
+        audio = await decode_async(audio)
+    return await asyncio.get_running_loop().run_in_executor(
+        TRANSCRIBE_POOL,
+        lambda: transcribe_text(whisper, audio, **options)
+    )
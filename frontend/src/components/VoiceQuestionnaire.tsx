@@ -138,15 +138,14 @@ const VoiceQuestionnaire: React.FC<VoiceQuestionnaireProps> = ({ phoneNumber, on
   };
 
   const sendAudioToBackend = async (audioBlob: Blob) => {
-    const formData = new FormData();
-    formData.append('audio_file', audioBlob, 'response.wav');
-
     try {
+      // Send the recording as the raw request body so the server can stream it
       const response = await fetch(
         `http://127.0.0.1:8000/voice-input/${phoneNumber}/${currentQuestionIndex}`,
         {
           method: 'POST',
-          body: formData,
+          headers: { 'Content-Type': audioBlob.type || 'application/octet-stream' },
+          body: audioBlob,
         }
       );
       const data = await response.json();
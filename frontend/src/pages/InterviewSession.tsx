@@ -256,10 +256,6 @@ function InterviewSession() {
     console.log('[InterviewSession] ========================================');
 
     try {
-      // Create form data
-      const formData = new FormData();
-      formData.append('audio_file', audioBlob, 'answer.webm');
-
       console.log(`[InterviewSession] 📤 Submitting answer for Q${currentQuestionIndex + 1}...`);
       console.log(`[InterviewSession]    Session ID: ${sessionId}`);
       console.log(`[InterviewSession]    Question Index: ${currentQuestionIndex}`);
@@ -271,9 +267,11 @@ function InterviewSession() {
 
       // Post to /interview/answer/{session_id}/{question_index}
       console.log('[InterviewSession] Sending fetch request...');
+      // Send the recording as the raw request body so the server can stream it
       const response = await fetch(url, {
         method: 'POST',
-        body: formData,
+        headers: { 'Content-Type': audioBlob.type || 'application/octet-stream' },
+        body: audioBlob,
       });
 
       console.log(`[InterviewSession] 📥 Response received: ${response.status} ${response.statusText}`);